@@ -18,7 +18,8 @@ else:
     st.stop()
 
 
-admin_manager.show_table()
+admin_manager.show_table_paginated()
+admin_manager.show_export()
 admin_options = admin_manager.fetch_options("Admin", "admin_id", "name")
 
 
@@ -94,12 +95,12 @@ elif option == "Delete":
         "Select Admin to Delete:", options=list(admin_options.keys())
     )
     admin_id = admin_options[selected_name]
-    current_admin_name = st.session_state["user_name"]
+    current_admin_id = st.session_state["user_id"]
 
     with st.expander("Confirm Deletion"):
         st.write(f"Are you sure you want to delete '{selected_name}'?")
         if st.button("Delete Admin"):
-            if selected_name == current_admin_name:
+            if admin_id == current_admin_id:
                 # Delete admin and log out
                 admin_manager.delete_admin(admin_id)
                 st.warning("You have deleted yourself. Logging out...")
@@ -0,0 +1,102 @@
+import streamlit as st
+import pandas as pd
+from jobs import (
+    JOB_TYPES,
+    get_job_result,
+    list_jobs,
+    retry_job,
+    submit_job,
+)
+
+if "user_name" in st.session_state:
+    user_name = st.session_state["user_name"]
+    st.title("Background Jobs")
+else:
+    st.error("You are not logged in. Please log in to access the dashboard.")
+    st.stop()
+
+st.caption(
+    "Jobs run in worker processes started with `python jobs.py worker`. "
+    "Reports and imports can also be queued from their own pages."
+)
+
+with st.expander("Submit Job"):
+    if st.button("Queue Schedule Cleanup"):
+        job_id = submit_job("cleanup", submitted_by=st.session_state.get("user_id"))
+        st.success(f"Cleanup queued as job #{job_id}.")
+
+col1, col2 = st.columns([3, 1])
+status_filter = col1.multiselect(
+    "Status", ["queued", "running", "succeeded", "failed"], default=[]
+)
+col2.button("Refresh")
+
+try:
+    jobs = list_jobs()
+except Exception as e:
+    st.error(f"Error fetching jobs: {e}")
+    st.stop()
+
+if status_filter:
+    jobs = jobs[jobs["status"].isin(status_filter)]
+
+if jobs.empty:
+    st.info("No jobs found.")
+    st.stop()
+
+jobs["job_type"] = jobs["job_type"].map(
+    lambda job_type: JOB_TYPES[job_type]["label"] if job_type in JOB_TYPES else job_type
+)
+st.dataframe(
+    jobs[
+        [
+            "job_id",
+            "job_type",
+            "status",
+            "progress",
+            "message",
+            "attempts",
+            "created_at",
+            "finished_at",
+        ]
+    ],
+    column_config={
+        "job_id": "Job",
+        "job_type": "Type",
+        "status": "Status",
+        "progress": st.column_config.ProgressColumn(
+            "Progress", min_value=0, max_value=1
+        ),
+        "message": "Message",
+        "attempts": "Attempts",
+        "created_at": "Submitted",
+        "finished_at": "Finished",
+    },
+    use_container_width=True,
+    hide_index=True,
+)
+
+st.write("### Job Details")
+selected_job_id = st.selectbox("Select Job", jobs["job_id"].tolist())
+job = jobs[jobs["job_id"] == selected_job_id].iloc[0]
+
+if job["status"] == "succeeded" and job["result_name"]:
+    result = get_job_result(selected_job_id)
+    if result:
+        result_name, result_mime, data = result
+        st.download_button(
+            label=f"Download {result_name}",
+            data=data,
+            file_name=result_name,
+            mime=result_mime,
+        )
+elif job["status"] == "failed":
+    st.error(f"Job failed after {job['attempts']} attempts.")
+    if pd.notna(job["error"]):
+        st.code(job["error"])
+    if st.button("Retry Job"):
+        retry_job(selected_job_id)
+        st.rerun()
+elif pd.notna(job["error"]):
+    st.warning("The last attempt failed; the job will be retried.")
+    st.code(job["error"])
@@ -0,0 +1,73 @@
+import streamlit as st
+import pandas as pd
+from importer import IMPORT_TARGETS, MAX_REPORTED_ERRORS, import_file
+from jobs import submit_job
+
+if "user_name" in st.session_state:
+    user_name = st.session_state["user_name"]
+    st.title("Import Data")
+else:
+    st.error("You are not logged in. Please log in to access the dashboard.")
+    st.stop()
+
+target = st.selectbox(
+    "Import Into",
+    options=list(IMPORT_TARGETS.keys()),
+    format_func=lambda name: name.replace("_", " ").title(),
+)
+spec = IMPORT_TARGETS[target]
+st.caption(f"Required columns: {', '.join(spec['columns'])}")
+if spec.get("optional"):
+    st.caption(f"Optional columns: {', '.join(spec['optional'])}")
+
+uploaded_file = st.file_uploader("Upload CSV or Excel File", type=["csv", "xlsx"])
+dry_run = st.checkbox("Only validate (do not save)")
+in_background = st.checkbox("Run in the background")
+
+if uploaded_file and in_background and st.button("Queue Import"):
+    job_id = submit_job(
+        "import",
+        {"target": target, "file_name": uploaded_file.name, "dry_run": dry_run},
+        payload=uploaded_file.getvalue(),
+        submitted_by=st.session_state.get("user_id"),
+    )
+    st.success(f"Import queued as job #{job_id}. Follow it on the Jobs page.")
+
+if uploaded_file and not in_background and st.button("Import"):
+    progress = st.empty()
+    try:
+        result = import_file(
+            target,
+            uploaded_file,
+            uploaded_file.name,
+            dry_run=dry_run,
+            progress=lambda rows: progress.caption(f"{rows} rows read..."),
+        )
+    except Exception as e:
+        st.error(f"Error importing file: {e}")
+        st.stop()
+    progress.empty()
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Rows Read", result["rows"])
+    col2.metric("Valid", result["valid"])
+    col3.metric("Invalid", result["invalid"])
+    if not dry_run:
+        col1.metric("Inserted", result["inserted"])
+        col2.metric("Updated", result["updated"])
+        col3.metric("Skipped", result["skipped"])
+        st.success("Import finished.")
+
+    if result["errors"]:
+        errors = pd.DataFrame(result["errors"], columns=["Row", "Error"])
+        if result["invalid"] > MAX_REPORTED_ERRORS:
+            st.warning(
+                f"Showing the first {MAX_REPORTED_ERRORS} of {result['invalid']} invalid rows."
+            )
+        st.dataframe(errors, use_container_width=True, hide_index=True)
+        st.download_button(
+            label="Download Errors",
+            data=errors.to_csv(index=False),
+            file_name=f"{target}_import_errors.csv",
+            mime="text/csv",
+        )
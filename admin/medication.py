@@ -17,7 +17,7 @@ class MedicineManagement(Management):
         SELECT m.medicine_id, m.medicine_name, m.description, m.usage, m.stock_quantity
         FROM Medicine m
         """
-        df = self.conn.query(query, ttl=0)
+        df = self.query(query)
         st.dataframe(df, use_container_width=True)
 
 
@@ -32,6 +32,7 @@ else:
 
 
 med_manager.show_table_meds()
+med_manager.show_export()
 medicines = med_manager.fetch_options("Medicine", "medicine_id", "medicine_name")
 
 option = st.selectbox("Select Operation", ["Create", "Update", "Delete"])
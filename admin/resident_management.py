@@ -1,5 +1,6 @@
 import streamlit as st
 from datetime import datetime
+from jobs import submit_job
 from management import Management
 from contact_number import ContactNumberInput
 
@@ -24,9 +25,11 @@ else:
     st.stop()
 
 st.subheader("Resident")
-resident_manager.show_table()
+resident_manager.show_table_paginated()
+resident_manager.show_export()
 st.subheader("Resident Emergency Contact")
-emergency_contact.show_table()
+emergency_contact.show_table_paginated()
+emergency_contact.show_export()
 
 residents = resident_manager.fetch_options("Resident", "resident_id", "name")
 
@@ -128,6 +131,6 @@ elif option == "Delete":
         if st.button("Delete Resident"):
             try:
                 resident_manager.delete_resident(selected_resident_id)
-                resident_manager.clean_up_null_entries()
+                submit_job("cleanup", submitted_by=st.session_state.get("user_id"))
             except Exception as e:
                 st.error(f"Error deleting resident: {e}")
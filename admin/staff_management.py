@@ -1,4 +1,5 @@
 import streamlit as st
+from jobs import submit_job
 from management import Management
 from datetime import date
 from contact_number import ContactNumberInput
@@ -18,7 +19,8 @@ else:
     st.error("You are not logged in. Please log in to access the dashboard.")
     st.stop()
 
-staff_manager.show_table()
+staff_manager.show_table_paginated()
+staff_manager.show_export()
 
 staff_options = staff_manager.fetch_options("Staff", "staff_id", "name")
 
@@ -109,4 +111,4 @@ elif option == "Delete":
         st.write(f"Are you sure you want to delete '{selected_name}'?")
         if st.button("Delete Staff"):
             staff_manager.delete_staff(staff_id)
-            staff_manager.clean_up_null_entries()
+            submit_job("cleanup", submitted_by=st.session_state.get("user_id"))
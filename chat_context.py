@@ -0,0 +1,261 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date
+from functools import lru_cache
+
+from sqlalchemy import text
+from wordfreq import top_n_list
+
+from database import connect, table_version
+from typo_index import TypoIndex
+
+# Everything the chatbot tells the model about a resident, as one JSON
+# document from a single round trip.
+CONTEXT_QUERY = text("""
+    SELECT json_build_object(
+        'resident', (
+            SELECT row_to_json(r)
+            FROM (
+                SELECT resident_id, name, gender, contact_number, date_of_birth,
+                    address
+                FROM Resident
+                WHERE resident_id = :resident_id
+            ) r
+        ),
+        'admin', (
+            SELECT row_to_json(a)
+            FROM (
+                SELECT name, contact_number FROM Admin ORDER BY admin_id LIMIT 1
+            ) a
+        ),
+        'emergency_contacts', COALESCE((
+            SELECT json_agg(c ORDER BY c.contact_id)
+            FROM (
+                SELECT contact_id, contact_name, relationship, contact_number
+                FROM Resident_Emergency_Contacts
+                WHERE resident_id = :resident_id
+            ) c
+        ), '[]'),
+        'schedule', COALESCE((
+            SELECT json_agg(s ORDER BY s.start_time)
+            FROM (
+                SELECT event_type, event_date, start_time, end_time, description
+                FROM Schedule
+                WHERE resident_id = :resident_id AND event_date = :day
+            ) s
+        ), '[]'),
+        'medications', COALESCE((
+            SELECT json_agg(
+                json_build_object(
+                    'medicine_name', m.medicine_name,
+                    'usage', m.usage,
+                    'description', m.description
+                )
+                ORDER BY r.record_date DESC
+            )
+            FROM Medical_Record r
+            JOIN Medicine m ON r.medicine_id = m.medicine_id
+            WHERE r.resident_id = :resident_id
+        ), '[]')
+    )
+""")
+
+DEFAULT_ADMIN = {"name": "Unknown", "contact_number": "123-456-7890"}
+
+# A cached context is dropped when the app writes one of these tables for its
+# resident (see invalidate_chat_context), when the day changes, or after
+# CONTEXT_TTL seconds, which bounds how stale writes from imports, job workers
+# and other app processes can leave it.
+CONTEXT_TABLES = (
+    "resident",
+    "admin",
+    "resident_emergency_contacts",
+    "schedule",
+    "medical_record",
+    "medicine",
+)
+CONTEXT_TTL = 60
+MAX_CACHED_CONTEXTS = 1000
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+# Core chatbot terms and the schedule event types, always part of the
+# typo-correction vocabulary
+CHAT_TERMS = ["schedule", "medication", "admin", "contact", "emergency", "medicine"]
+EVENT_TYPES = ["Medical Appointment", "Social Activity", "Other"]
+# English words that are never corrected, however close to a term or name
+ENGLISH_WORD_COUNT = 50000
+# Tables the rest of the typo-correction vocabulary is read from
+VOCABULARY_TABLES = ("medicine", "staff")
+MEDICINE_NAMES_QUERY = text("SELECT medicine_name FROM Medicine")
+STAFF_NAMES_QUERY = text("SELECT name FROM Staff")
+
+_typo_index = None
+_typo_index_version = None
+_typo_index_lock = threading.Lock()
+
+# Context is fetched here while the page prepares the rest of the request
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="chat-context")
+
+
+def fetch_chat_context(resident_id, day=None):
+    """
+    Fetch the resident, admin contact, emergency contacts, the day's schedule
+    and medications in one query. Returns a dict keyed by those names.
+    """
+    with connect() as conn:
+        context = conn.execute(
+            CONTEXT_QUERY, {"resident_id": resident_id, "day": day or date.today()}
+        ).scalar_one()
+    context["admin"] = context["admin"] or DEFAULT_ADMIN
+    return context
+
+
+def _cached_context(resident_id, day):
+    with _cache_lock:
+        entry = _cache.get(resident_id)
+        if entry is None:
+            return None
+        if entry["day"] != day or entry["expires_at"] < time.monotonic():
+            del _cache[resident_id]
+            return None
+        _cache.move_to_end(resident_id)
+        return entry["context"], entry["block"]
+
+
+def get_chat_context(resident_id):
+    """
+    Return (context, context_block) for a resident, from the per-resident
+    cache while it is still valid, otherwise freshly fetched and rendered.
+    """
+    day = date.today()
+    cached = _cached_context(resident_id, day)
+    if cached:
+        return cached
+
+    context = fetch_chat_context(resident_id, day=day)
+    block = build_context_block(context)
+    with _cache_lock:
+        _cache[resident_id] = {
+            "day": day,
+            "expires_at": time.monotonic() + CONTEXT_TTL,
+            "context": context,
+            "block": block,
+        }
+        _cache.move_to_end(resident_id)
+        while len(_cache) > MAX_CACHED_CONTEXTS:
+            _cache.popitem(last=False)
+    return context, block
+
+
+def invalidate_chat_context(resident_id=None):
+    """
+    Drop one resident's cached context, or every resident's. Called after the
+    app writes one of CONTEXT_TABLES.
+    """
+    with _cache_lock:
+        if resident_id is None:
+            _cache.clear()
+        else:
+            _cache.pop(resident_id, None)
+
+
+def submit_chat_context(resident_id):
+    """
+    Return a Future of get_chat_context(). A cached context is returned as an
+    already completed Future; otherwise it is fetched in the background.
+    """
+    cached = _cached_context(resident_id, date.today())
+    if cached:
+        future = Future()
+        future.set_result(cached)
+        return future
+    return _executor.submit(get_chat_context, resident_id)
+
+
+def build_context_block(context):
+    """Render the fetched context as the system message the model receives."""
+    resident = context["resident"]
+    admin = context["admin"]
+    emergency_contacts = context["emergency_contacts"]
+    schedule = context["schedule"]
+    medications = context["medications"]
+
+    emergency_contact_info = (
+        f"Their emergency contact name is {emergency_contacts[0]['contact_name']}.\n"
+        f"Their emergency contact relationship is {emergency_contacts[0]['relationship']}.\n"
+        f"Their emergency contact number is {emergency_contacts[0]['contact_number']}."
+        if emergency_contacts
+        else "No emergency contacts found."
+    )
+
+    schedule_info = (
+        "\n".join(
+            [
+                f"- {event['event_type']} on {event['event_date']} from {event['start_time']} to {event['end_time']} ({event['description']})"
+                for event in schedule
+            ]
+        )
+        if schedule
+        else "No events scheduled."
+    )
+
+    medication_info = (
+        "\n".join(
+            [
+                f"- {med['medicine_name']}: {med['usage']} ({med['description']})"
+                for med in medications
+            ]
+        )
+        if medications
+        else "No medications recorded."
+    )
+
+    return f"""The user's name is {resident["name"]}
+                (ID: {resident["resident_id"]}).
+                Their gender is {resident["gender"]}.
+                Their contact number is {resident["contact_number"]}.
+                Their date of birth is {resident["date_of_birth"]}.
+                Their address is {resident["address"]}.
+
+                {emergency_contact_info}
+
+                Admin contact is {admin["name"]} with their phone number {admin["contact_number"]}.
+
+                Today's schedule:
+                {schedule_info}
+
+                Current medications:
+                {medication_info}
+
+                Do not generate data not found in the database.
+                Do not answer questions that are not related to the elderly care management system:
+                Example out of range questions: What is the history of Malaysia."""
+
+
+@lru_cache(maxsize=1)
+def _english_words():
+    return top_n_list("en", ENGLISH_WORD_COUNT)
+
+
+def get_typo_index():
+    """
+    Return the chatbot's typo index over CHAT_TERMS, EVENT_TYPES, medicine
+    names and staff names, rebuilt only after those tables are written.
+    """
+    global _typo_index, _typo_index_version
+    version = tuple(table_version(table) for table in VOCABULARY_TABLES)
+    if _typo_index is None or _typo_index_version != version:
+        with _typo_index_lock:
+            if _typo_index is None or _typo_index_version != version:
+                with connect() as conn:
+                    medicines = conn.execute(MEDICINE_NAMES_QUERY).scalars().all()
+                    staff = conn.execute(STAFF_NAMES_QUERY).scalars().all()
+                index = TypoIndex(CHAT_TERMS + EVENT_TYPES + medicines, names=staff)
+                index.add_known(_english_words())
+                _typo_index = index
+                _typo_index_version = version
+    return _typo_index
@@ -0,0 +1 @@
+"""Lets the tests import the root modules when pytest is run from here."""
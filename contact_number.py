@@ -1,12 +1,16 @@
+import pandas as pd
 import streamlit as st
 
+MIN_LENGTH = 10
+MAX_LENGTH = 11
+
 
 class ContactNumberInput:
     def __init__(self, label, placeholder="Enter contact number"):
         self.label = label
         self.placeholder = placeholder
-        self.min_length = 10
-        self.max_length = 11
+        self.min_length = MIN_LENGTH
+        self.max_length = MAX_LENGTH
         self.contact_number = None
 
     def render(self, key=None):
@@ -26,3 +30,19 @@ class ContactNumberInput:
             else:
                 return self.contact_number
         return None
+
+    @staticmethod
+    def validate_column(numbers):
+        """
+        Apply the render() checks to a whole column of contact numbers.
+        Returns the error message for each row, or None where the number is valid.
+        """
+        numbers = numbers.fillna("").astype(str).str.strip()
+        lengths = numbers.str.len()
+
+        # Assigned in reverse priority so the first failing check wins, as in render()
+        errors = pd.Series(None, index=numbers.index, dtype=object)
+        errors[lengths < MIN_LENGTH] = "Contact number is too short."
+        errors[lengths > MAX_LENGTH] = "Contact number is more than 11 digits."
+        errors[~numbers.str.isdigit()] = "Contact number must contain only numbers."
+        return errors
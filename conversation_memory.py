@@ -0,0 +1,104 @@
+HISTORY_TOKEN_BUDGET = 800  # tokens of recent turns sent to the model
+SUMMARY_TOKEN_LIMIT = 200  # tokens the rolling summary is kept within
+MAX_SESSION_MESSAGES = 50  # messages kept per session for display
+
+# Turns are folded into the summary in batches: once the recent turns go over
+# the budget, the oldest are summarized until they fit in this share of it.
+KEEP_RATIO = 0.5
+
+
+def estimate_tokens(text):
+    """Rough token count, about four characters per token for English text."""
+    return len(text) // 4 + 1
+
+
+def format_transcript(messages):
+    return "\n".join(
+        f"{message['role'].capitalize()}: {message['content']}" for message in messages
+    )
+
+
+def extractive_summary(summary, messages, token_limit=SUMMARY_TOKEN_LIMIT):
+    """
+    Fold messages into the summary without a model: the previous summary plus
+    the resident's questions, keeping the most recent text within the limit.
+    """
+    questions = [
+        f"Resident asked: {message['content']}"
+        for message in messages
+        if message["role"] == "user"
+    ]
+    text = "\n".join(filter(None, [summary, *questions]))
+    return text[-token_limit * 4 :]
+
+
+class ConversationMemory:
+    """
+    A chat session's messages, with a token-budgeted window of recent turns
+    and a rolling summary of the turns before it.
+    """
+
+    def __init__(
+        self,
+        token_budget=HISTORY_TOKEN_BUDGET,
+        max_messages=MAX_SESSION_MESSAGES,
+    ):
+        self.token_budget = token_budget
+        self.max_messages = max_messages
+        self.messages = []
+        self.summary = ""
+        self.dropped = 0  # messages removed after being summarized
+        self._folded = 0  # leading messages already part of the summary
+
+    def add(self, message):
+        """Append a message dict with at least "role" and "content"."""
+        self.messages.append(message)
+
+    def recent(self):
+        """Messages not yet folded into the summary."""
+        return self.messages[self._folded :]
+
+    def model_messages(self):
+        """The summary and recent turns, as messages for the chat completion API."""
+        history = [
+            {"role": message["role"], "content": message["content"]}
+            for message in self.recent()
+        ]
+        if self.summary:
+            history.insert(
+                0,
+                {
+                    "role": "system",
+                    "content": f"Summary of the earlier conversation:\n{self.summary}",
+                },
+            )
+        return history
+
+    def _fold(self, count, summarize):
+        if count <= 0:
+            return
+        folded = self.messages[self._folded : self._folded + count]
+        self.summary = summarize(self.summary, folded)
+        self._folded += count
+
+    def compact(self, summarize=extractive_summary):
+        """
+        Summarize the oldest recent turns once they exceed the token budget,
+        and drop summarized messages beyond max_messages.
+        `summarize(summary, messages)` returns the updated summary.
+        """
+        recent = self.recent()
+        tokens = sum(estimate_tokens(message["content"]) for message in recent)
+        if tokens > self.token_budget:
+            count = 0
+            while count < len(recent) and tokens > self.token_budget * KEEP_RATIO:
+                tokens -= estimate_tokens(recent[count]["content"])
+                count += 1
+            self._fold(count, summarize)
+
+        excess = len(self.messages) - self.max_messages
+        if excess > 0:
+            self._fold(excess - self._folded, summarize)
+            del self.messages[:excess]
+            self._folded -= excess
+            self.dropped += excess
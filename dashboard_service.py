@@ -0,0 +1,74 @@
+import threading
+
+from sqlalchemy import text
+
+from database import connect
+
+SUMMARY_TABLES = ("resident", "staff")
+
+_lock = threading.Lock()
+_refresh_lock = threading.Lock()
+_refresh_requested = False
+_refresh_thread = None
+
+DASHBOARD_QUERY = text("""
+    SELECT s.total_residents, s.staff_on_duty, s.staff_roles, s.resident_genders,
+        s.resident_ages, s.refreshed_at, s.refreshed_at::date < CURRENT_DATE AS stale,
+        (SELECT contact_number FROM Admin WHERE admin_id = :admin_id) AS contact_number
+    FROM dashboard_summary s
+""")
+
+
+def refresh_summary():
+    """Recompute the dashboard_summary view without blocking readers."""
+    with _lock, connect() as conn:
+        conn.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY dashboard_summary"))
+        conn.commit()
+
+
+def _refresh_in_background():
+    global _refresh_requested, _refresh_thread
+    while True:
+        with _refresh_lock:
+            if not _refresh_requested:
+                _refresh_thread = None
+                return
+            _refresh_requested = False
+        try:
+            refresh_summary()
+        except Exception as e:
+            print(e)
+
+
+def request_refresh(*table_names):
+    """
+    Refresh the summary view in a background thread when any of `table_names`
+    (or, with none given, anything) feeds it. Requests made while a refresh
+    runs are folded into one more refresh.
+    """
+    global _refresh_requested, _refresh_thread
+    if table_names and not {name.lower() for name in table_names} & set(SUMMARY_TABLES):
+        return
+    with _refresh_lock:
+        _refresh_requested = True
+        if _refresh_thread is None:
+            # Not a daemon, so a CLI import or worker finishes the refresh on exit
+            _refresh_thread = threading.Thread(
+                target=_refresh_in_background, name="dashboard-refresh"
+            )
+            _refresh_thread.start()
+
+
+def get_dashboard_data(admin_id):
+    """
+    Return every admin dashboard KPI and distribution in one round trip.
+
+    Only the summary view is read: write paths refresh it in the background
+    through request_refresh(). A view computed on an earlier day (ages move
+    with the date) is returned as is and refreshed for the next render.
+    """
+    with connect() as conn:
+        row = conn.execute(DASHBOARD_QUERY, {"admin_id": admin_id}).mappings().first()
+    if row["stale"]:
+        request_refresh()
+    return dict(row)
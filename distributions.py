@@ -0,0 +1,80 @@
+from datetime import date
+
+import streamlit as st
+
+from database import query, table_version
+
+# Whitelisted categorical fields: name -> (table, column)
+CATEGORICAL_FIELDS = {
+    "gender": ("Resident", "gender"),
+    "role": ("Staff", "role"),
+    "event_type": ("Schedule", "event_type"),
+}
+
+DEFAULT_AGE_BINS = 10
+
+# Ages are bucketed into `bins` equal integer-width ranges starting at the
+# youngest resident, so every bin covers whole years.
+AGE_HISTOGRAM_QUERY = """
+    WITH ages AS (
+        SELECT EXTRACT(YEAR FROM age(date_of_birth))::integer AS age
+        FROM Resident
+        WHERE date_of_birth IS NOT NULL
+    ),
+    bounds AS (
+        SELECT MIN(age) AS low,
+            GREATEST(CEIL((MAX(age) - MIN(age) + 1)::numeric / :bins), 1)::integer
+                AS width
+        FROM ages
+    )
+    SELECT low + (bucket - 1) * width AS bin_start,
+        low + bucket * width - 1 AS bin_end,
+        count
+    FROM (
+        SELECT width_bucket(age, low, low + width * :bins, :bins) AS bucket,
+            COUNT(*) AS count
+        FROM ages, bounds
+        GROUP BY bucket
+    ) buckets, bounds
+    ORDER BY bucket
+"""
+
+
+@st.cache_data(show_spinner=False, max_entries=32, ttl=600)
+def _category_counts(table_name, column, version):
+    return query(
+        f"""
+        SELECT COALESCE({column}, 'Unknown') AS {column}, COUNT(*) AS count
+        FROM {table_name}
+        GROUP BY 1
+        ORDER BY count DESC
+        """
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=32, ttl=600)
+def _age_histogram(bins, version, day):
+    result = query(AGE_HISTOGRAM_QUERY, {"bins": bins})
+    result["label"] = [
+        str(start) if start == end else f"{start}-{end}"
+        for start, end in zip(result["bin_start"], result["bin_end"])
+    ]
+    return result
+
+
+def category_counts(field):
+    """
+    Return a DataFrame with one row per value of `field` and its count,
+    computed with GROUP BY in the database.
+    """
+    table_name, column = CATEGORICAL_FIELDS[field]
+    return _category_counts(table_name, column, table_version(table_name))
+
+
+def age_histogram(bins=DEFAULT_AGE_BINS):
+    """
+    Return resident ages binned in the database with width_bucket, as rows of
+    (bin_start, bin_end, count, label). Empty bins are omitted.
+    """
+    # Keyed on the day as well, since ages move with the date
+    return _age_histogram(bins, table_version("resident"), date.today())
@@ -0,0 +1,554 @@
+import argparse
+import io
+import sys
+from datetime import date, datetime, time
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from contact_number import ContactNumberInput
+from dashboard_service import request_refresh
+from database import bump_table_version, raw_transaction
+
+DEFAULT_CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 1000
+STAGING_TABLE = "import_staging"
+MAX_INTEGER = 2**31 - 1  # PostgreSQL integer columns
+
+# Residents and staff are matched on username and medicines on medicine_name:
+# existing rows are updated and new ones inserted. A resident row's emergency
+# contact is added unless that resident already has the same one. Schedules
+# and emergency contacts are always inserted, resolving residents/staff by
+# username.
+RESIDENT_MERGE = f"""
+WITH latest AS (
+    SELECT DISTINCT ON (username) *
+    FROM {STAGING_TABLE}
+    ORDER BY username, row_number DESC
+),
+updated AS (
+    UPDATE Resident r
+    SET name = l.name, date_of_birth = l.date_of_birth::date, gender = l.gender,
+        contact_number = l.contact_number, address = l.address, password = l.password
+    FROM latest l
+    WHERE r.username = l.username
+    RETURNING r.resident_id, r.username
+),
+inserted AS (
+    INSERT INTO Resident
+    (name, date_of_birth, gender, contact_number, address, username, password)
+    SELECT l.name, l.date_of_birth::date, l.gender, l.contact_number, l.address,
+        l.username, l.password
+    FROM latest l
+    WHERE NOT EXISTS (SELECT 1 FROM Resident r WHERE r.username = l.username)
+    RETURNING resident_id, username
+),
+contacts AS (
+    INSERT INTO Resident_Emergency_Contacts
+    (resident_id, contact_name, relationship, contact_number)
+    SELECT t.resident_id, l.contact_name, l.relationship, l.emergency_contact_number
+    FROM (
+        SELECT resident_id, username FROM inserted
+        UNION ALL SELECT resident_id, username FROM updated
+    ) t
+    JOIN latest l ON l.username = t.username
+    WHERE l.contact_name <> '' AND l.emergency_contact_number <> ''
+        AND NOT EXISTS (
+            SELECT 1
+            FROM Resident_Emergency_Contacts c
+            WHERE c.resident_id = t.resident_id
+                AND c.contact_name = l.contact_name
+                AND c.contact_number = l.emergency_contact_number
+        )
+    RETURNING contact_id
+)
+SELECT (SELECT COUNT(*) FROM inserted), (SELECT COUNT(*) FROM updated);
+"""
+
+STAFF_MERGE = f"""
+WITH latest AS (
+    SELECT DISTINCT ON (username) *
+    FROM {STAGING_TABLE}
+    ORDER BY username, row_number DESC
+),
+updated AS (
+    UPDATE Staff s
+    SET name = l.name, role = l.role, contact_number = l.contact_number,
+        password = l.password, hire_date = l.hire_date::date
+    FROM latest l
+    WHERE s.username = l.username
+    RETURNING s.staff_id
+),
+inserted AS (
+    INSERT INTO Staff (name, role, contact_number, username, password, hire_date)
+    SELECT l.name, l.role, l.contact_number, l.username, l.password,
+        l.hire_date::date
+    FROM latest l
+    WHERE NOT EXISTS (SELECT 1 FROM Staff s WHERE s.username = l.username)
+    RETURNING staff_id
+)
+SELECT (SELECT COUNT(*) FROM inserted), (SELECT COUNT(*) FROM updated);
+"""
+
+MEDICINE_MERGE = f"""
+WITH latest AS (
+    SELECT DISTINCT ON (medicine_name) *
+    FROM {STAGING_TABLE}
+    ORDER BY medicine_name, row_number DESC
+),
+updated AS (
+    UPDATE Medicine m
+    SET description = l.description, usage = l.usage,
+        stock_quantity = l.stock_quantity::integer
+    FROM latest l
+    WHERE m.medicine_name = l.medicine_name
+    RETURNING m.medicine_id
+),
+inserted AS (
+    INSERT INTO Medicine (medicine_name, description, usage, stock_quantity)
+    SELECT l.medicine_name, l.description, l.usage, l.stock_quantity::integer
+    FROM latest l
+    WHERE NOT EXISTS (
+        SELECT 1 FROM Medicine m WHERE m.medicine_name = l.medicine_name
+    )
+    RETURNING medicine_id
+)
+SELECT (SELECT COUNT(*) FROM inserted), (SELECT COUNT(*) FROM updated);
+"""
+
+SCHEDULE_MERGE = f"""
+WITH inserted AS (
+    INSERT INTO Schedule
+    (resident_id, staff_id, event_type, event_date, start_time, end_time, description)
+    SELECT r.resident_id, s.staff_id, i.event_type, i.event_date::date,
+        i.start_time::time, i.end_time::time, i.description
+    FROM {STAGING_TABLE} i
+    JOIN (
+        SELECT DISTINCT ON (username) resident_id, username
+        FROM Resident ORDER BY username, resident_id
+    ) r ON r.username = i.resident_username
+    JOIN (
+        SELECT DISTINCT ON (username) staff_id, username
+        FROM Staff ORDER BY username, staff_id
+    ) s ON s.username = i.staff_username
+    RETURNING schedule_id
+)
+SELECT (SELECT COUNT(*) FROM inserted), 0;
+"""
+
+EMERGENCY_CONTACT_MERGE = f"""
+WITH inserted AS (
+    INSERT INTO Resident_Emergency_Contacts
+    (resident_id, contact_name, relationship, contact_number)
+    SELECT r.resident_id, i.contact_name, i.relationship, i.contact_number
+    FROM {STAGING_TABLE} i
+    JOIN (
+        SELECT DISTINCT ON (username) resident_id, username
+        FROM Resident ORDER BY username, resident_id
+    ) r ON r.username = i.resident_username
+    RETURNING contact_id
+)
+SELECT (SELECT COUNT(*) FROM inserted), 0;
+"""
+
+# Staged rows whose usernames match no resident or staff member, with the
+# total count on every row; checked before the merge, which would skip them.
+SCHEDULE_UNMATCHED = f"""
+SELECT row_number, concat_ws(' ',
+        CASE WHEN NOT EXISTS (
+            SELECT 1 FROM Resident r WHERE r.username = i.resident_username
+        ) THEN 'resident_username matches no resident.' END,
+        CASE WHEN NOT EXISTS (
+            SELECT 1 FROM Staff s WHERE s.username = i.staff_username
+        ) THEN 'staff_username matches no staff member.' END
+    ),
+    COUNT(*) OVER ()
+FROM {STAGING_TABLE} i
+WHERE NOT EXISTS (SELECT 1 FROM Resident r WHERE r.username = i.resident_username)
+    OR NOT EXISTS (SELECT 1 FROM Staff s WHERE s.username = i.staff_username)
+ORDER BY row_number
+LIMIT %(limit)s
+"""
+
+EMERGENCY_CONTACT_UNMATCHED = f"""
+SELECT row_number, 'resident_username matches no resident.', COUNT(*) OVER ()
+FROM {STAGING_TABLE} i
+WHERE NOT EXISTS (SELECT 1 FROM Resident r WHERE r.username = i.resident_username)
+ORDER BY row_number
+LIMIT %(limit)s
+"""
+
+# What each import target expects in the file and how its columns are checked.
+IMPORT_TARGETS = {
+    "resident": {
+        "columns": [
+            "name",
+            "date_of_birth",
+            "gender",
+            "contact_number",
+            "address",
+            "username",
+            "password",
+        ],
+        "optional": ["contact_name", "relationship", "emergency_contact_number"],
+        "required": [
+            "name",
+            "date_of_birth",
+            "gender",
+            "contact_number",
+            "username",
+            "password",
+        ],
+        "dates": ["date_of_birth"],
+        "contact_numbers": ["contact_number", "emergency_contact_number"],
+        "choices": {"gender": ["Male", "Female"]},
+        "together": [("contact_name", "emergency_contact_number")],
+        "tables": ["resident", "resident_emergency_contacts"],
+        "merge": RESIDENT_MERGE,
+    },
+    "resident_emergency_contacts": {
+        "columns": [
+            "resident_username",
+            "contact_name",
+            "relationship",
+            "contact_number",
+        ],
+        "required": ["resident_username", "contact_name", "contact_number"],
+        "contact_numbers": ["contact_number"],
+        "tables": ["resident_emergency_contacts"],
+        "merge": EMERGENCY_CONTACT_MERGE,
+        "unmatched": EMERGENCY_CONTACT_UNMATCHED,
+    },
+    "staff": {
+        "columns": [
+            "name",
+            "role",
+            "contact_number",
+            "username",
+            "password",
+            "hire_date",
+        ],
+        "required": [
+            "name",
+            "role",
+            "contact_number",
+            "username",
+            "password",
+            "hire_date",
+        ],
+        "dates": ["hire_date"],
+        "contact_numbers": ["contact_number"],
+        "choices": {"role": ["Doctor", "Nurse", "Caregiver"]},
+        "tables": ["staff"],
+        "merge": STAFF_MERGE,
+    },
+    "medicine": {
+        "columns": ["medicine_name", "description", "usage", "stock_quantity"],
+        "required": ["medicine_name", "description", "usage", "stock_quantity"],
+        "positive_integers": ["stock_quantity"],
+        "tables": ["medicine"],
+        "merge": MEDICINE_MERGE,
+    },
+    "schedule": {
+        "columns": [
+            "resident_username",
+            "staff_username",
+            "event_type",
+            "event_date",
+            "start_time",
+            "end_time",
+            "description",
+        ],
+        "required": [
+            "resident_username",
+            "staff_username",
+            "event_type",
+            "event_date",
+            "start_time",
+            "end_time",
+            "description",
+        ],
+        "dates": ["event_date"],
+        "times": ["start_time", "end_time"],
+        "choices": {"event_type": ["Medical Appointment", "Social Activity", "Other"]},
+        "time_order": [("start_time", "end_time")],
+        "tables": ["schedule"],
+        "merge": SCHEDULE_MERGE,
+        "unmatched": SCHEDULE_UNMATCHED,
+    },
+}
+
+
+def _cell_text(value):
+    """Render an Excel cell value the way it would appear in a CSV file."""
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.date().isoformat() if value.time() == time() else value.isoformat()
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _read_excel_chunks(file, chunk_size):
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [_cell_text(cell) for cell in next(rows, ())]
+        batch = []
+        for row in rows:
+            cells = [_cell_text(cell) for cell in row[: len(header)]]
+            batch.append(cells + [""] * (len(header) - len(cells)))
+            if len(batch) == chunk_size:
+                yield pd.DataFrame(batch, columns=header)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header)
+    finally:
+        workbook.close()
+
+
+def read_chunks(file, file_name, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Stream a CSV or XLSX file as DataFrames of at most `chunk_size` text rows.
+    Each chunk carries a `row_number` column with the row's line in the file.
+    """
+    if file_name.lower().endswith((".xlsx", ".xlsm")):
+        chunks = _read_excel_chunks(file, chunk_size)
+    else:
+        chunks = pd.read_csv(
+            file, chunksize=chunk_size, dtype=str, keep_default_na=False
+        )
+
+    offset = 0
+    for chunk in chunks:
+        chunk.columns = [str(column).strip().lower() for column in chunk.columns]
+        # Line 1 is the header
+        chunk.insert(0, "row_number", np.arange(offset + 2, offset + 2 + len(chunk)))
+        offset += len(chunk)
+        yield chunk
+
+
+def _flag(mask, message):
+    return pd.Series(np.where(mask, message, None), index=mask.index, dtype=object)
+
+
+def validate_chunk(chunk, target):
+    """
+    Check a chunk with column-wise rules.
+
+    Returns the valid rows (normalised for loading) and a list of
+    (row_number, message) pairs for the rest.
+    """
+    spec = IMPORT_TARGETS[target]
+    columns = spec["columns"] + spec.get("optional", [])
+    chunk = chunk.copy()
+    for column in columns:
+        if column not in chunk:
+            chunk[column] = ""
+        chunk[column] = chunk[column].fillna("").astype(str).str.strip()
+
+    problems = []
+    for column in spec["required"]:
+        problems.append(_flag(chunk[column].eq(""), f"{column} is required."))
+
+    for column in spec.get("contact_numbers", []):
+        errors = ContactNumberInput.validate_column(chunk[column])
+        problems.append(errors.where(chunk[column].ne(""), None))
+
+    for column, choices in spec.get("choices", {}).items():
+        invalid = chunk[column].ne("") & ~chunk[column].isin(choices)
+        problems.append(
+            _flag(invalid, f"{column} must be one of: {', '.join(choices)}.")
+        )
+
+    for column in spec.get("dates", []):
+        parsed = pd.to_datetime(chunk[column], format="ISO8601", errors="coerce")
+        problems.append(
+            _flag(chunk[column].ne("") & parsed.isna(), f"{column} is not a date.")
+        )
+        chunk[column] = parsed.dt.strftime("%Y-%m-%d").fillna("")
+
+    parsed_times = {}
+    for column in spec.get("times", []):
+        parsed = pd.to_datetime(
+            chunk[column], format="%H:%M:%S", errors="coerce"
+        ).fillna(pd.to_datetime(chunk[column], format="%H:%M", errors="coerce"))
+        problems.append(
+            _flag(chunk[column].ne("") & parsed.isna(), f"{column} is not a time.")
+        )
+        chunk[column] = parsed.dt.strftime("%H:%M:%S").fillna("")
+        parsed_times[column] = parsed
+
+    for start, end in spec.get("time_order", []):
+        problems.append(
+            _flag(
+                parsed_times[start] >= parsed_times[end],
+                f"{end} must be later than {start}.",
+            )
+        )
+
+    for column in spec.get("positive_integers", []):
+        numbers = pd.to_numeric(chunk[column], errors="coerce")
+        whole = numbers.ge(1) & numbers.le(MAX_INTEGER) & numbers.mod(1).eq(0)
+        problems.append(
+            _flag(
+                chunk[column].ne("") & ~whole,
+                f"{column} must be a whole number from 1 to {MAX_INTEGER}.",
+            )
+        )
+        # Loaded as plain digits, so "5.0" or "1e3" cast cleanly to integer
+        chunk.loc[whole, column] = numbers[whole].astype("int64").astype(str)
+
+    for first, second in spec.get("together", []):
+        problems.append(
+            _flag(
+                chunk[first].eq("") != chunk[second].eq(""),
+                f"{first} and {second} must be given together.",
+            )
+        )
+
+    if "password" in columns:
+        problems.append(
+            _flag(
+                chunk["password"].ne("") & chunk["password"].str.len().lt(8),
+                "Password must be at least 8 characters long.",
+            )
+        )
+
+    problems = pd.concat(problems, axis=1)
+    failed = problems.notna().any(axis=1)
+    errors = [
+        (row_number, " ".join(message for message in messages if pd.notna(message)))
+        for row_number, messages in zip(
+            chunk.loc[failed, "row_number"],
+            problems[failed].itertuples(index=False, name=None),
+        )
+    ]
+    return chunk.loc[~failed, ["row_number"] + columns], errors
+
+
+def _copy_chunk(cur, valid, columns):
+    """Stream validated rows into the staging table with COPY."""
+    buffer = io.StringIO()
+    valid.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    column_list = ", ".join(["row_number"] + columns)
+    cur.copy_expert(
+        f"COPY {STAGING_TABLE} ({column_list}) FROM STDIN "
+        f"WITH (FORMAT csv, FORCE_NOT_NULL ({', '.join(columns)}))",
+        buffer,
+    )
+
+
+def import_file(
+    target, file, file_name, chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False, progress=None
+):
+    """
+    Validate a CSV/XLSX file chunk by chunk and load its valid rows.
+
+    Valid rows are COPYed into a temporary staging table and merged into the
+    target tables with one set-based statement, all in a single transaction.
+    Invalid rows are skipped and reported. `progress` is called with the
+    number of rows read so far. Returns a summary dict.
+    """
+    spec = IMPORT_TARGETS[target]
+    columns = spec["columns"] + spec.get("optional", [])
+    result = {
+        "rows": 0,
+        "valid": 0,
+        "invalid": 0,
+        "inserted": 0,
+        "updated": 0,
+        "skipped": 0,
+        "errors": [],
+    }
+
+    def validated_chunks():
+        for chunk in read_chunks(file, file_name, chunk_size):
+            missing = [column for column in spec["columns"] if column not in chunk]
+            if missing:
+                raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+            valid, errors = validate_chunk(chunk, target)
+            result["rows"] += len(chunk)
+            result["valid"] += len(valid)
+            result["invalid"] += len(errors)
+            room = MAX_REPORTED_ERRORS - len(result["errors"])
+            result["errors"].extend(errors[:room])
+            if progress:
+                progress(result["rows"])
+            yield valid
+
+    if dry_run:
+        for _ in validated_chunks():
+            pass
+        return result
+
+    with raw_transaction() as conn, conn.cursor() as cur:
+        column_definitions = ", ".join(f"{column} text" for column in columns)
+        cur.execute(
+            f"CREATE TEMP TABLE {STAGING_TABLE} "
+            f"(row_number integer, {column_definitions}) ON COMMIT DROP"
+        )
+        for valid in validated_chunks():
+            if not valid.empty:
+                _copy_chunk(cur, valid, columns)
+        if "unmatched" in spec:
+            # Reported as invalid rows rather than counted as skipped
+            room = MAX_REPORTED_ERRORS - len(result["errors"])
+            cur.execute(spec["unmatched"], {"limit": max(room, 1)})
+            unmatched = cur.fetchall()
+            if unmatched:
+                result["valid"] -= unmatched[0][2]
+                result["invalid"] += unmatched[0][2]
+                result["errors"].extend(
+                    (row_number, message) for row_number, message, _ in unmatched[:room]
+                )
+                result["errors"].sort()
+        cur.execute(spec["merge"])
+        result["inserted"], result["updated"] = cur.fetchone()
+
+    result["skipped"] = result["valid"] - result["inserted"] - result["updated"]
+    bump_table_version(*spec["tables"])
+    request_refresh(*spec["tables"])
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Import residents, staff, medicines or schedules from CSV/XLSX."
+    )
+    parser.add_argument("target", choices=list(IMPORT_TARGETS))
+    parser.add_argument("path", help="CSV or XLSX file to import")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Only validate, do not load"
+    )
+    args = parser.parse_args()
+
+    with open(args.path, "rb") as file:
+        result = import_file(
+            args.target,
+            file,
+            args.path,
+            chunk_size=args.chunk_size,
+            dry_run=args.dry_run,
+        )
+    print(
+        f"Rows: {result['rows']}, valid: {result['valid']}, "
+        f"invalid: {result['invalid']}, inserted: {result['inserted']}, "
+        f"updated: {result['updated']}, skipped: {result['skipped']}"
+    )
+    for row_number, message in result["errors"]:
+        print(f"Row {row_number}: {message}")
+    if result["invalid"] > len(result["errors"]):
+        print(f"... and {result['invalid'] - len(result['errors'])} more errors.")
+    return 1 if result["invalid"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+import re
+
+WORD_PATTERN = re.compile(r"[a-z]+")
+
+# Longer prompts are usually open-ended and go to the model
+MAX_INTENT_WORDS = 12
+
+# Keywords that identify each locally answerable intent
+INTENT_KEYWORDS = {
+    "schedule": {
+        "schedule",
+        "schedules",
+        "event",
+        "events",
+        "activity",
+        "activities",
+        "appointment",
+        "appointments",
+        "plan",
+        "plans",
+        "agenda",
+    },
+    "medication": {
+        "medication",
+        "medications",
+        "medicine",
+        "medicines",
+        "meds",
+        "pill",
+        "pills",
+        "drug",
+        "drugs",
+        "prescription",
+        "prescriptions",
+    },
+    "emergency_contact": {"emergency", "kin", "guardian"},
+    "admin_contact": {"admin", "administrator", "office", "manager", "reception"},
+}
+
+# Words that make a question more than a lookup: advice, changes, costs,
+# reasons or filters the local answers cannot apply
+OPEN_ENDED_WORDS = {
+    "why",
+    "how",
+    "when",
+    "where",
+    "should",
+    "explain",
+    "side",
+    "effect",
+    "effects",
+    "dose",
+    "dosage",
+    "safe",
+    "stop",
+    "quit",
+    "skip",
+    "allergic",
+    "allergy",
+    "allergies",
+    "insurance",
+    "covered",
+    "cost",
+    "price",
+    "pay",
+    "instead",
+    "change",
+    "cancel",
+    "reschedule",
+    "book",
+    "add",
+    "remove",
+    "with",
+}
+
+# Yes/no questions ("do I...", "can I...") are left to the model, since a
+# bare list does not answer them
+QUESTION_OPENERS = {
+    "do",
+    "does",
+    "did",
+    "am",
+    "is",
+    "are",
+    "was",
+    "were",
+    "can",
+    "could",
+    "should",
+    "will",
+    "would",
+    "have",
+    "has",
+    "may",
+    "must",
+    "shall",
+}
+
+# Local answers only cover today, so any other time reference goes to the model
+TIME_WORDS = {
+    "tomorrow",
+    "yesterday",
+    "weekend",
+    "weekends",
+    "week",
+    "weeks",
+    "month",
+    "months",
+    "year",
+    "next",
+    "last",
+    "previous",
+    "upcoming",
+    "later",
+    "ago",
+    "future",
+    "past",
+    "soon",
+    "until",
+    "since",
+    "date",
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+    "january",
+    "february",
+    "march",
+    "april",
+    "may",
+    "june",
+    "july",
+    "august",
+    "september",
+    "october",
+    "november",
+    "december",
+    "jan",
+    "feb",
+    "mar",
+    "apr",
+    "jun",
+    "jul",
+    "aug",
+    "sep",
+    "sept",
+    "oct",
+    "nov",
+    "dec",
+}
+# Dates and ordinals such as "5th", "12/3" or "2025"
+NUMBER_PATTERN = re.compile(r"\d")
+
+
+def classify_intent(prompt):
+    """
+    Return the intent a prompt asks about ("schedule", "medication",
+    "emergency_contact" or "admin_contact"), or None when it should go to the
+    model. Only short lookups about today that match exactly one intent are
+    classified; questions, advice and other dates go to the model.
+    """
+    lowered = re.sub(r"\bnext of kin\b", "kin", prompt.lower())
+    words = WORD_PATTERN.findall(lowered)
+    if not words or len(words) > MAX_INTENT_WORDS:
+        return None
+    if words[0] in QUESTION_OPENERS or NUMBER_PATTERN.search(lowered):
+        return None
+    if OPEN_ENDED_WORDS.intersection(words) or TIME_WORDS.intersection(words):
+        return None
+
+    matches = [
+        intent
+        for intent, keywords in INTENT_KEYWORDS.items()
+        if keywords.intersection(words)
+    ]
+    return matches[0] if len(matches) == 1 else None
+
+
+def _time(value):
+    # Times arrive as "HH:MM:SS" strings from the JSON context
+    return str(value)[:5] if value else "?"
+
+
+def _answer_schedule(context):
+    schedule = context["schedule"]
+    if not schedule:
+        return "You have no events scheduled for today."
+    lines = [
+        f"- {_time(event['start_time'])} to {_time(event['end_time'])}: "
+        f"{event['event_type']}"
+        + (f" ({event['description']})" if event["description"] else "")
+        for event in schedule
+    ]
+    return "Here is your schedule for today:\n" + "\n".join(lines)
+
+
+def _answer_medication(context):
+    medications = context["medications"]
+    if not medications:
+        return "No medications are recorded for you."
+    lines = [
+        f"- {med['medicine_name']}"
+        + (f": {med['usage']}" if med["usage"] else "")
+        + (f" ({med['description']})" if med["description"] else "")
+        for med in medications
+    ]
+    return "These are your current medications:\n" + "\n".join(lines)
+
+
+def _answer_emergency_contact(context):
+    contacts = context["emergency_contacts"]
+    if not contacts:
+        return "No emergency contacts are recorded for you. Please contact the admin."
+    lines = [
+        f"- {contact['contact_name']} ({contact['relationship'] or 'contact'}): "
+        f"{contact['contact_number']}"
+        for contact in contacts
+    ]
+    return "Your emergency contacts are:\n" + "\n".join(lines)
+
+
+def _answer_admin_contact(context):
+    admin = context["admin"]
+    return f"You can reach {admin['name']} at {admin['contact_number']}."
+
+
+INTENT_ANSWERS = {
+    "schedule": _answer_schedule,
+    "medication": _answer_medication,
+    "emergency_contact": _answer_emergency_contact,
+    "admin_contact": _answer_admin_contact,
+}
+
+
+def answer_intent(intent, context):
+    """Answer a classified intent from a chat_context.fetch_chat_context() dict."""
+    return INTENT_ANSWERS[intent](context)
@@ -0,0 +1,402 @@
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import time
+import traceback
+from datetime import date
+from io import BytesIO
+
+from sqlalchemy import text
+
+from database import connect, query
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+
+POLL_INTERVAL = 2  # seconds a worker sleeps when the queue is empty
+STALE_AFTER = 300  # seconds without a heartbeat before a running job is reclaimed
+HEARTBEAT_INTERVAL = 30  # minimum seconds between message-only progress updates
+RETRY_DELAY = 30  # seconds before a failed attempt is retried, times the attempt
+
+CLAIM_QUERY = text("""
+    UPDATE Job
+    SET status = 'running', attempts = attempts + 1, worker = :worker,
+        started_at = now(), heartbeat_at = now(), progress = 0, message = NULL
+    WHERE job_id = (
+        SELECT job_id
+        FROM Job
+        WHERE (status = 'queued' AND run_after <= now())
+            OR (
+                status = 'running'
+                AND heartbeat_at < now() - make_interval(secs => :stale_after)
+            )
+        ORDER BY job_id
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING job_id, job_type, params, payload, attempts, max_attempts, worker
+""")
+
+
+def _run_report(params, payload, progress):
+    from report_generator import build_report
+
+    progress(0.1, "Fetching schedule")
+    file_name, pdf = build_report(
+        params["entity_type"],
+        params["entity_id"],
+        date.fromisoformat(params["start_date"]),
+        date.fromisoformat(params["end_date"]),
+        entity_name=params.get("entity_name"),
+        progress=lambda rows: progress(None, f"{rows} rows rendered"),
+    )
+    return pdf, file_name, "application/pdf", "Report ready."
+
+
+def _run_batch_report(params, payload, progress):
+    from report_generator import batch_report_file_name, build_batch_report
+
+    entity_types = params["entity_types"]
+    start_date = date.fromisoformat(params["start_date"])
+    end_date = date.fromisoformat(params["end_date"])
+    archive = build_batch_report(
+        entity_types,
+        start_date,
+        end_date,
+        progress=lambda done, total: progress(
+            done / total, f"{done} of {total} reports rendered"
+        ),
+    )
+    return (
+        archive,
+        batch_report_file_name(entity_types, start_date, end_date),
+        "application/zip",
+        "Reports ready.",
+    )
+
+
+def _run_import(params, payload, progress):
+    import pandas as pd
+
+    from importer import import_file
+
+    result = import_file(
+        params["target"],
+        BytesIO(payload),
+        params["file_name"],
+        dry_run=params.get("dry_run", False),
+        progress=lambda rows: progress(None, f"{rows} rows read"),
+    )
+    message = (
+        f"Rows: {result['rows']}, valid: {result['valid']}, "
+        f"invalid: {result['invalid']}, inserted: {result['inserted']}, "
+        f"updated: {result['updated']}, skipped: {result['skipped']}"
+    )
+    if not result["errors"]:
+        return None, None, None, message
+    errors = pd.DataFrame(result["errors"], columns=["Row", "Error"])
+    return (
+        errors.to_csv(index=False).encode(),
+        f"{params['target']}_import_errors.csv",
+        "text/csv",
+        message,
+    )
+
+
+def _run_cleanup(params, payload, progress):
+    from management import delete_orphaned_schedules
+
+    deleted = delete_orphaned_schedules()
+    return None, None, None, f"Deleted {deleted} orphaned schedule rows."
+
+
+# Handlers return (result_bytes, result_name, result_mime, message).
+JOB_TYPES = {
+    "report": {
+        "label": "Report",
+        "run": _run_report,
+    },
+    "batch_report": {
+        "label": "Batch Report",
+        "run": _run_batch_report,
+    },
+    "import": {
+        "label": "Data Import",
+        "run": _run_import,
+    },
+    "cleanup": {
+        "label": "Schedule Cleanup",
+        "run": _run_cleanup,
+    },
+}
+
+
+def submit_job(job_type, params=None, payload=None, submitted_by=None, max_attempts=3):
+    """Queue a job and return its id."""
+    if job_type not in JOB_TYPES:
+        raise ValueError(f"Unknown job type: {job_type}")
+    with connect() as conn:
+        job_id = conn.execute(
+            text("""
+                INSERT INTO Job (job_type, params, payload, submitted_by, max_attempts)
+                VALUES (:job_type, :params, :payload, :submitted_by, :max_attempts)
+                RETURNING job_id
+            """),
+            {
+                "job_type": job_type,
+                "params": json.dumps(params or {}),
+                "payload": payload,
+                "submitted_by": submitted_by,
+                "max_attempts": max_attempts,
+            },
+        ).scalar_one()
+        conn.commit()
+    return job_id
+
+
+def list_jobs(limit=100):
+    """Return the most recent jobs, without their payloads or results."""
+    return query(
+        """
+        SELECT job_id, job_type, status, progress, message, attempts, max_attempts,
+            error, result_name, octet_length(result) AS result_size, params,
+            created_at, started_at, finished_at
+        FROM Job
+        ORDER BY created_at DESC
+        LIMIT :limit
+        """,
+        {"limit": limit},
+    )
+
+
+def get_job_result(job_id):
+    """Return (result_name, result_mime, result_bytes) of a finished job."""
+    with connect() as conn:
+        row = conn.execute(
+            text(
+                "SELECT result_name, result_mime, result FROM Job "
+                "WHERE job_id = :job_id AND status = 'succeeded'"
+            ),
+            {"job_id": job_id},
+        ).first()
+    if row is None or row[2] is None:
+        return None
+    return row[0], row[1], bytes(row[2])
+
+
+def retry_job(job_id):
+    """Queue a failed job again with a fresh set of attempts."""
+    with connect() as conn:
+        updated = conn.execute(
+            text("""
+                UPDATE Job
+                SET status = 'queued', attempts = 0, error = NULL, run_after = now()
+                WHERE job_id = :job_id AND status = 'failed'
+            """),
+            {"job_id": job_id},
+        ).rowcount
+        conn.commit()
+    return updated
+
+
+def claim_job(worker):
+    """Claim the next runnable job for `worker`, or return None."""
+    with connect() as conn:
+        row = (
+            conn.execute(CLAIM_QUERY, {"worker": worker, "stale_after": STALE_AFTER})
+            .mappings()
+            .first()
+        )
+        conn.commit()
+    return dict(row) if row else None
+
+
+# Job updates only apply while `worker` still owns the job, so a worker whose
+# job was reclaimed as stale cannot overwrite the new attempt.
+def update_progress(job_id, worker, progress=None, message=None):
+    """Record progress (0 to 1) and a status message; doubles as the heartbeat."""
+    with connect() as conn:
+        conn.execute(
+            text("""
+                UPDATE Job
+                SET progress = COALESCE(:progress, progress),
+                    message = COALESCE(:message, message), heartbeat_at = now()
+                WHERE job_id = :job_id AND status = 'running' AND worker = :worker
+            """),
+            {
+                "job_id": job_id,
+                "worker": worker,
+                "progress": progress,
+                "message": message,
+            },
+        )
+        conn.commit()
+
+
+def _progress_reporter(job_id, worker):
+    """
+    Return the `progress(progress=None, message=None)` callback for a job.
+    Message-only updates are written at most every HEARTBEAT_INTERVAL seconds.
+    """
+    last_update = None
+
+    def progress(progress=None, message=None):
+        nonlocal last_update
+        now = time.monotonic()
+        if (
+            progress is None
+            and last_update is not None
+            and now - last_update < HEARTBEAT_INTERVAL
+        ):
+            return
+        last_update = now
+        update_progress(job_id, worker, progress, message)
+
+    return progress
+
+
+def _finish_job(job_id, worker, result, result_name, result_mime, message):
+    with connect() as conn:
+        conn.execute(
+            text("""
+                UPDATE Job
+                SET status = 'succeeded', progress = 1, message = :message,
+                    result = :result, result_name = :result_name,
+                    result_mime = :result_mime, payload = NULL, finished_at = now()
+                WHERE job_id = :job_id AND status = 'running' AND worker = :worker
+            """),
+            {
+                "job_id": job_id,
+                "worker": worker,
+                "result": result,
+                "result_name": result_name,
+                "result_mime": result_mime,
+                "message": message,
+            },
+        )
+        conn.commit()
+
+
+def _fail_job(job_id, worker, attempts, max_attempts, error):
+    """Queue the job for another attempt with a growing delay, or fail it."""
+    with connect() as conn:
+        if attempts < max_attempts:
+            conn.execute(
+                text("""
+                    UPDATE Job
+                    SET status = 'queued', error = :error,
+                        run_after = now() + make_interval(secs => :delay)
+                    WHERE job_id = :job_id AND status = 'running' AND worker = :worker
+                """),
+                {
+                    "job_id": job_id,
+                    "worker": worker,
+                    "error": error,
+                    "delay": RETRY_DELAY * attempts,
+                },
+            )
+        else:
+            conn.execute(
+                text("""
+                    UPDATE Job
+                    SET status = 'failed', error = :error, finished_at = now()
+                    WHERE job_id = :job_id AND status = 'running' AND worker = :worker
+                """),
+                {"job_id": job_id, "worker": worker, "error": error},
+            )
+        conn.commit()
+
+
+def run_job(job):
+    """Run a claimed job and record its outcome."""
+    job_id, worker = job["job_id"], job["worker"]
+    if job["attempts"] > job["max_attempts"]:
+        # Reclaimed after its worker died on the last attempt
+        _fail_job(
+            job_id, worker, job["attempts"], job["max_attempts"], "Worker stopped."
+        )
+        return
+
+    try:
+        handler = JOB_TYPES[job["job_type"]]["run"]
+        outcome = handler(
+            job["params"],
+            bytes(job["payload"]) if job["payload"] is not None else None,
+            _progress_reporter(job_id, worker),
+        )
+    except Exception:
+        _fail_job(
+            job_id,
+            worker,
+            job["attempts"],
+            job["max_attempts"],
+            traceback.format_exc(),
+        )
+    else:
+        _finish_job(job_id, worker, *outcome)
+
+
+def run_worker(worker=None, once=False):
+    """Claim and run jobs until interrupted, or until the queue is empty if `once`."""
+    worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+    try:
+        while True:
+            job = claim_job(worker)
+            if job:
+                run_job(job)
+            elif once:
+                return
+            else:
+                time.sleep(POLL_INTERVAL)
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run or submit background jobs.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    worker_parser = subparsers.add_parser("worker", help="Start worker processes")
+    worker_parser.add_argument("--processes", type=int, default=2)
+    worker_parser.add_argument(
+        "--once", action="store_true", help="Exit when the queue is empty"
+    )
+    submit_parser = subparsers.add_parser("submit", help="Queue a job")
+    submit_parser.add_argument("job_type", choices=list(JOB_TYPES))
+    submit_parser.add_argument("--params", default="{}", help="JSON parameters")
+    subparsers.add_parser("list", help="Show recent jobs")
+    args = parser.parse_args()
+
+    if args.command == "worker":
+        # Spawned, so no process inherits the parent's connections
+        context = multiprocessing.get_context("spawn")
+        host = socket.gethostname()
+        workers = [
+            context.Process(
+                target=run_worker, args=(f"{host}:{os.getpid()}-{number}", args.once)
+            )
+            for number in range(args.processes)
+        ]
+        for process in workers:
+            process.start()
+        try:
+            for process in workers:
+                process.join()
+        except KeyboardInterrupt:
+            for process in workers:
+                process.join()
+    elif args.command == "submit":
+        job_id = submit_job(args.job_type, json.loads(args.params))
+        print(f"Queued job #{job_id}")
+    else:
+        for job in list_jobs().fillna("").itertuples():
+            print(
+                f"#{job.job_id} {job.job_type} {job.status} "
+                f"{job.progress:.0%} {job.message}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+import argparse
+import hashlib
+import os
+import re
+import sys
+
+from database import raw_connection, raw_transaction
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+MIGRATION_FILE = re.compile(r"^(\d{4})_(\w+)\.sql$")
+# Arbitrary advisory lock key, so two runners never migrate at once
+MIGRATION_LOCK_ID = 4_172_001
+# First line of migrations that cannot run in a transaction block, such as
+# CREATE INDEX CONCURRENTLY. Their statements are run one at a time, so they
+# are split on ";" and must not contain one elsewhere.
+NO_TRANSACTION_HEADER = "-- no-transaction"
+
+# Tables smaller than this are cheap to scan and are left out of the report
+MIN_TABLE_ROWS = 1000
+
+
+def discover_migrations():
+    """Return (version, name, path) for every migration file, in version order."""
+    migrations = []
+    for file_name in sorted(os.listdir(MIGRATIONS_DIR)):
+        match = MIGRATION_FILE.match(file_name)
+        if match:
+            version, name = match.groups()
+            migrations.append((version, name, os.path.join(MIGRATIONS_DIR, file_name)))
+    return migrations
+
+
+def _checksum(sql):
+    return hashlib.sha256(sql.encode()).hexdigest()
+
+
+def _ensure_migrations_table(cur):
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version VARCHAR(4) PRIMARY KEY,
+            name TEXT NOT NULL,
+            checksum TEXT NOT NULL,
+            applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+        """
+    )
+
+
+def _is_applied(cur, version):
+    cur.execute("SELECT 1 FROM schema_migrations WHERE version = %s", (version,))
+    return cur.fetchone() is not None
+
+
+def _record_migration(cur, version, name, sql):
+    cur.execute(
+        "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+        (version, name, _checksum(sql)),
+    )
+
+
+def _split_statements(sql):
+    """Split a migration into its statements, dropping comment-only chunks."""
+    statements = []
+    for chunk in sql.split(";"):
+        code = [
+            line
+            for line in chunk.splitlines()
+            if line.strip() and not line.strip().startswith("--")
+        ]
+        if code:
+            statements.append(chunk.strip())
+    return statements
+
+
+def _apply_in_transaction(version, name, sql):
+    """Apply a migration in one transaction; return False if it already ran."""
+    with raw_transaction() as conn, conn.cursor() as cur:
+        # Index builds on large tables outlast the pool's statement_timeout
+        cur.execute("SET LOCAL statement_timeout = 0")
+        cur.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK_ID,))
+        _ensure_migrations_table(cur)
+        if _is_applied(cur, version):
+            return False
+        cur.execute(sql)
+        _record_migration(cur, version, name, sql)
+    return True
+
+
+def _apply_without_transaction(version, name, sql):
+    """
+    Apply a NO_TRANSACTION_HEADER migration statement by statement in
+    autocommit mode, under a session-level advisory lock. A statement that
+    fails leaves the earlier ones applied, so these migrations must be safe to
+    re-run (IF NOT EXISTS); an interrupted CREATE INDEX CONCURRENTLY leaves an
+    invalid index that has to be dropped before retrying.
+    """
+    conn = raw_connection()
+    conn.dbapi_connection.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SET statement_timeout = 0")
+            cur.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_ID,))
+            try:
+                _ensure_migrations_table(cur)
+                if _is_applied(cur, version):
+                    return False
+                for statement in _split_statements(sql):
+                    cur.execute(statement)
+                _record_migration(cur, version, name, sql)
+            finally:
+                cur.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_ID,))
+                cur.execute("RESET statement_timeout")
+    finally:
+        conn.dbapi_connection.autocommit = False
+        conn.close()
+    return True
+
+
+def applied_migrations():
+    """Return {version: checksum} for the migrations already applied."""
+    with raw_transaction() as conn, conn.cursor() as cur:
+        _ensure_migrations_table(cur)
+        cur.execute("SELECT version, checksum FROM schema_migrations")
+        return dict(cur.fetchall())
+
+
+def upgrade(target=None):
+    """
+    Apply pending migrations up to `target` (all of them by default).
+    Each migration runs in its own transaction, without a statement timeout,
+    unless it starts with NO_TRANSACTION_HEADER. Returns the applied versions.
+    """
+    applied = []
+    for version, name, path in discover_migrations():
+        if target and version > target:
+            break
+        with open(path) as file:
+            sql = file.read()
+
+        if sql.startswith(NO_TRANSACTION_HEADER):
+            applied_now = _apply_without_transaction(version, name, sql)
+        else:
+            applied_now = _apply_in_transaction(version, name, sql)
+        if applied_now:
+            applied.append(version)
+    return applied
+
+
+def status():
+    """Return (version, name, state) for every migration file."""
+    applied = applied_migrations()
+    rows = []
+    for version, name, path in discover_migrations():
+        with open(path) as file:
+            checksum = _checksum(file.read())
+        if version not in applied:
+            state = "pending"
+        elif applied[version] != checksum:
+            state = "applied (file changed since)"
+        else:
+            state = "applied"
+        rows.append((version, name, state))
+    return rows
+
+
+def index_report():
+    """
+    Report indexes that are never used and tables that look like they need one.
+
+    Unused indexes have not been scanned since statistics were last reset
+    (primary keys and unique indexes are ignored). Tables are flagged as
+    missing an index when most of their reads are sequential scans.
+    """
+    with raw_transaction() as conn, conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT s.relname, s.indexrelname,
+                pg_size_pretty(pg_relation_size(s.indexrelid))
+            FROM pg_stat_user_indexes s
+            JOIN pg_index i ON i.indexrelid = s.indexrelid
+            WHERE s.idx_scan = 0 AND NOT i.indisunique AND NOT i.indisprimary
+            ORDER BY pg_relation_size(s.indexrelid) DESC
+            """
+        )
+        unused = cur.fetchall()
+
+        cur.execute(
+            """
+            SELECT relname, seq_scan, COALESCE(idx_scan, 0), seq_tup_read, n_live_tup
+            FROM pg_stat_user_tables
+            WHERE n_live_tup >= %s AND seq_scan > COALESCE(idx_scan, 0)
+            ORDER BY seq_tup_read DESC
+            """,
+            (MIN_TABLE_ROWS,),
+        )
+        missing = cur.fetchall()
+    return {"unused": unused, "missing": missing}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the elderlymanagement schema.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    upgrade_parser = subparsers.add_parser("upgrade", help="Apply pending migrations")
+    upgrade_parser.add_argument("--target", help="Stop after this version, e.g. 0002")
+    subparsers.add_parser("status", help="List migrations and whether they ran")
+    subparsers.add_parser("indexes", help="Report unused and missing indexes")
+    args = parser.parse_args()
+
+    if args.command == "upgrade":
+        applied = upgrade(args.target)
+        print(f"Applied: {', '.join(applied)}" if applied else "Already up to date.")
+    elif args.command == "status":
+        for version, name, state in status():
+            print(f"{version} {name}: {state}")
+    else:
+        report = index_report()
+        print("Unused indexes:")
+        for table, index, size in report["unused"]:
+            print(f"  {table}.{index} ({size})")
+        print("Tables read mostly by sequential scans:")
+        for table, seq_scan, idx_scan, seq_tup_read, live_rows in report["missing"]:
+            print(
+                f"  {table}: {seq_scan} seq scans vs {idx_scan} index scans, "
+                f"{seq_tup_read} rows read sequentially, {live_rows} rows"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+-- Base schema for the elderlymanagement database.
+-- IF NOT EXISTS lets this run against databases created before migrations existed.
+
+CREATE TABLE IF NOT EXISTS Admin (
+    admin_id SERIAL PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    username VARCHAR(50) NOT NULL,
+    password VARCHAR(255) NOT NULL,
+    contact_number VARCHAR(15)
+);
+
+CREATE TABLE IF NOT EXISTS Resident (
+    resident_id SERIAL PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    date_of_birth DATE,
+    gender VARCHAR(10),
+    contact_number VARCHAR(15),
+    address TEXT,
+    username VARCHAR(50) NOT NULL,
+    password VARCHAR(255) NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS Resident_Emergency_Contacts (
+    contact_id SERIAL PRIMARY KEY,
+    resident_id INTEGER REFERENCES Resident (resident_id) ON DELETE CASCADE,
+    contact_name VARCHAR(100) NOT NULL,
+    relationship VARCHAR(50),
+    contact_number VARCHAR(15)
+);
+
+CREATE TABLE IF NOT EXISTS Staff (
+    staff_id SERIAL PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    role VARCHAR(50),
+    contact_number VARCHAR(15),
+    username VARCHAR(50) NOT NULL,
+    password VARCHAR(255) NOT NULL,
+    hire_date DATE
+);
+
+CREATE TABLE IF NOT EXISTS Medicine (
+    medicine_id SERIAL PRIMARY KEY,
+    medicine_name VARCHAR(100) NOT NULL,
+    description TEXT,
+    usage TEXT,
+    stock_quantity INTEGER DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS Medical_Record (
+    record_id SERIAL PRIMARY KEY,
+    resident_id INTEGER REFERENCES Resident (resident_id) ON DELETE CASCADE,
+    diagnosis TEXT,
+    treatment TEXT,
+    doctor_id INTEGER REFERENCES Staff (staff_id) ON DELETE SET NULL,
+    record_date DATE,
+    medicine_id INTEGER REFERENCES Medicine (medicine_id) ON DELETE SET NULL
+);
+
+-- Deleting a resident or staff member leaves their events with a NULL id;
+-- Management.clean_up_null_entries removes events that lost both.
+CREATE TABLE IF NOT EXISTS Schedule (
+    schedule_id SERIAL PRIMARY KEY,
+    resident_id INTEGER REFERENCES Resident (resident_id) ON DELETE SET NULL,
+    staff_id INTEGER REFERENCES Staff (staff_id) ON DELETE SET NULL,
+    event_type VARCHAR(50),
+    event_date DATE,
+    start_time TIME,
+    end_time TIME,
+    description TEXT
+);
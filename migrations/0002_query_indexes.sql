@@ -0,0 +1,37 @@
+-- no-transaction
+-- Indexes for the queries the pages run on every render, built without
+-- blocking writes to the tables.
+
+-- Resident/staff schedules for a day, ordered by start time.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS schedule_resident_date_idx
+    ON Schedule (resident_id, event_date, start_time);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS schedule_staff_date_idx
+    ON Schedule (staff_id, event_date, start_time) INCLUDE (event_type, end_time);
+-- Keyset pagination of the schedule listing and date-range reports.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS schedule_event_date_idx
+    ON Schedule (event_date, schedule_id);
+
+-- A resident's medication, newest record first.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS medical_record_resident_date_idx
+    ON Medical_Record (resident_id, record_date DESC) INCLUDE (medicine_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS medical_record_date_idx
+    ON Medical_Record (record_date, record_id);
+
+-- Foreign keys, so cascading deletes do not scan the child tables.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS resident_emergency_contacts_resident_idx
+    ON Resident_Emergency_Contacts (resident_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS medical_record_doctor_idx
+    ON Medical_Record (doctor_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS medical_record_medicine_idx
+    ON Medical_Record (medicine_id);
+
+-- Login and imports look users up by username.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS resident_username_idx ON Resident (username);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS staff_username_idx ON Staff (username);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS admin_username_idx ON Admin (username);
+
+-- Name lookups used by the dashboards and dropdowns.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS resident_name_idx ON Resident (name);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS staff_name_idx ON Staff (name);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS admin_name_idx ON Admin (name);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS medicine_name_idx ON Medicine (medicine_name);
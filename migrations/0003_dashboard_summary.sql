@@ -0,0 +1,30 @@
+-- One-row summary behind the admin dashboard, refreshed by dashboard_service.
+-- Distributions are stored as [label, count] pairs so NULL labels survive.
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS dashboard_summary AS
+SELECT
+    1 AS summary_id,
+    (SELECT COUNT(*) FROM Resident) AS total_residents,
+    (SELECT COUNT(*) FROM Staff WHERE role != 'Other') AS staff_on_duty,
+    (
+        SELECT COALESCE(jsonb_agg(jsonb_build_array(role, count) ORDER BY role), '[]')
+        FROM (SELECT role, COUNT(*) AS count FROM Staff GROUP BY role) roles
+    ) AS staff_roles,
+    (
+        SELECT COALESCE(jsonb_agg(jsonb_build_array(gender, count) ORDER BY gender), '[]')
+        FROM (SELECT gender, COUNT(*) AS count FROM Resident GROUP BY gender) genders
+    ) AS resident_genders,
+    (
+        SELECT COALESCE(jsonb_agg(jsonb_build_array(age, count) ORDER BY age), '[]')
+        FROM (
+            SELECT EXTRACT(YEAR FROM age(date_of_birth))::integer AS age, COUNT(*) AS count
+            FROM Resident
+            WHERE date_of_birth IS NOT NULL
+            GROUP BY 1
+        ) ages
+    ) AS resident_ages,
+    now() AS refreshed_at;
+
+-- Required by REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS dashboard_summary_id_idx
+    ON dashboard_summary (summary_id);
@@ -0,0 +1,35 @@
+-- Background jobs, claimed by worker processes with FOR UPDATE SKIP LOCKED.
+
+CREATE TABLE IF NOT EXISTS Job (
+    job_id SERIAL PRIMARY KEY,
+    job_type VARCHAR(50) NOT NULL,
+    params JSONB NOT NULL DEFAULT '{}',
+    payload BYTEA,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued'
+        CHECK (status IN ('queued', 'running', 'succeeded', 'failed')),
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    error TEXT,
+    result BYTEA,
+    result_name TEXT,
+    result_mime TEXT,
+    submitted_by INTEGER REFERENCES Admin (admin_id) ON DELETE SET NULL,
+    worker VARCHAR(100),
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    run_after TIMESTAMPTZ NOT NULL DEFAULT now(),
+    started_at TIMESTAMPTZ,
+    heartbeat_at TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ
+);
+
+-- The claim query: oldest runnable queued job first.
+CREATE INDEX IF NOT EXISTS job_queued_idx
+    ON Job (run_after, job_id) WHERE status = 'queued';
+-- Running jobs whose worker stopped sending heartbeats.
+CREATE INDEX IF NOT EXISTS job_running_idx
+    ON Job (heartbeat_at) WHERE status = 'running';
+-- The jobs page, newest first.
+CREATE INDEX IF NOT EXISTS job_created_idx
+    ON Job (created_at DESC);
@@ -0,0 +1,39 @@
+-- Write versions of the tables the app caches, bumped by a statement-level
+-- trigger in the writing transaction. Every process (app, importer CLI, job
+-- workers) sees every other's writes through them.
+
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name TEXT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO table_versions (table_name, version)
+    VALUES (TG_TABLE_NAME, 1)
+    ON CONFLICT (table_name) DO UPDATE SET version = table_versions.version + 1;
+    RETURN NULL;
+END;
+$$;
+
+DO $$
+DECLARE
+    tracked TEXT;
+BEGIN
+    FOREACH tracked IN ARRAY ARRAY[
+        'admin', 'resident', 'resident_emergency_contacts', 'staff',
+        'medicine', 'medical_record', 'schedule'
+    ] LOOP
+        EXECUTE format(
+            'DROP TRIGGER IF EXISTS %1$s_version ON %1$I', tracked
+        );
+        EXECUTE format(
+            'CREATE TRIGGER %1$s_version '
+            'AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %1$I '
+            'FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()',
+            tracked
+        );
+    END LOOP;
+END;
+$$;
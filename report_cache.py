@@ -0,0 +1,70 @@
+import hashlib
+import os
+import tempfile
+
+CACHE_DIR = os.environ.get(
+    "REPORT_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".report_cache"),
+)
+MAX_CACHE_BYTES = int(os.environ.get("REPORT_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+
+def cache_key(*parts):
+    """Hash the parts of a cache key into a file-name-safe string."""
+    return hashlib.sha256("\x1f".join(str(part) for part in parts).encode()).hexdigest()
+
+
+def _path(key):
+    return os.path.join(CACHE_DIR, f"{key}.bin")
+
+
+def get(key):
+    """Return the cached bytes for `key`, or None. A hit marks the entry as used."""
+    path = _path(key)
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+        os.utime(path)  # The modification time is the LRU order
+    except FileNotFoundError:
+        return None
+    return data
+
+
+def put(key, data):
+    """Store bytes under `key`, then evict least recently used entries over the limit."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Written to a temporary file and renamed, so readers never see a partial entry
+    fd, temp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, _path(key))
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    evict()
+
+
+def evict(max_bytes=MAX_CACHE_BYTES):
+    """Delete the least recently used entries until the cache fits in `max_bytes`."""
+    entries = []
+    total = 0
+    with os.scandir(CACHE_DIR) as scan:
+        for entry in scan:
+            if not entry.name.endswith(".bin"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass  # Evicted by another process
+        total -= size
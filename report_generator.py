@@ -0,0 +1,707 @@
+import multiprocessing
+import os
+import zipfile
+from collections import Counter
+from contextlib import closing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from functools import lru_cache
+from itertools import groupby
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+import matplotlib
+
+matplotlib.use("Agg")  # Rendered off-screen, also in worker processes
+
+import matplotlib.pyplot as plt
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Frame, Paragraph, Table, TableStyle
+from sqlalchemy import text
+
+import report_cache
+from database import connect, query
+
+LOGO_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "images", "logo.png"
+)
+
+ENTITY_COLUMNS = {"Resident": "resident_id", "Staff": "staff_id"}
+ENTITY_TABLES = {"Resident": "Resident", "Staff": "Staff"}
+
+# Rows fetched per round trip from the report's server-side cursor
+REPORT_FETCH_SIZE = 1000
+
+# Part of every report cache key; bump it when the PDF layout changes
+REPORT_FORMAT_VERSION = 2
+
+# Rendered chart PNGs kept per process, keyed by the aggregated counts
+CHART_CACHE_SIZE = 128
+
+PAGE_MARGIN = 50
+# Rows per Table flowable; bounds the flowables held while rendering
+TABLE_CHUNK_ROWS = 200
+TABLE_HEADERS = ["Event Date", "Start Time", "End Time", "Event Type", "Description"]
+TABLE_COLUMN_WIDTHS = [70, 60, 60, 95, 210]
+
+# Styles are built once per process and shared by every report
+_styles = getSampleStyleSheet()
+CELL_STYLE = _styles["BodyText"].clone("ReportCell", fontSize=9, leading=11)
+HEADER_STYLE = CELL_STYLE.clone("ReportHeader", fontName="Helvetica-Bold")
+SECTION_STYLE = _styles["Heading3"].clone("ReportSection", spaceBefore=12)
+ROW_TABLE_STYLE = TableStyle(
+    [
+        ("FONT", (0, 0), (-1, -1), "Helvetica", 9),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ("LINEBELOW", (0, 0), (-1, -1), 0.25, colors.lightgrey),
+    ]
+)
+HEADER_TABLE_STYLE = TableStyle(
+    [
+        ("VALIGN", (0, 0), (-1, -1), "BOTTOM"),
+        ("LINEBELOW", (0, 0), (-1, -1), 1, colors.black),
+    ]
+)
+
+REPORT_COLUMNS = ["event_date", "start_time", "end_time", "event_type", "description"]
+
+
+def stream_report_data(entity_type, entity_id, start_date, end_date):
+    """
+    Yield the schedule rows of one resident or staff member in a date range.
+
+    Rows come from a server-side cursor REPORT_FETCH_SIZE at a time, so the
+    whole result is never held in memory. The connection stays checked out
+    until the generator is exhausted or closed.
+    """
+    column = ENTITY_COLUMNS[entity_type]
+    with connect() as conn:
+        result = conn.execution_options(
+            stream_results=True, yield_per=REPORT_FETCH_SIZE
+        ).execute(
+            text(f"""
+                SELECT event_date, start_time, end_time, event_type, description
+                FROM Schedule
+                WHERE {column} = :entity_id
+                    AND event_date BETWEEN :start_date AND :end_date
+                ORDER BY event_date, start_time;
+            """),
+            {"entity_id": entity_id, "start_date": start_date, "end_date": end_date},
+        )
+        for rows in result.mappings().partitions():
+            yield from rows
+
+
+def report_file_name(entity_type, entity_name):
+    return f"{entity_type}_Report_{entity_name}_{datetime.now().strftime('%Y%m%d')}.pdf"
+
+
+def aggregate_events(data):
+    """Count events per type and per date in one pass over the rows."""
+    type_counts = Counter()
+    date_counts = Counter()
+    for entry in data:
+        type_counts[entry["event_type"]] += 1
+        date_counts[entry["event_date"]] += 1
+    return type_counts, date_counts
+
+
+def _chart_key(counts):
+    # Canonical, hashable form of the counts; used as the image cache key
+    return tuple(sorted(counts.items(), key=lambda item: str(item[0])))
+
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def _render_bar_chart(frequencies):
+    fig, ax = plt.subplots(figsize=(8, 4))
+    try:
+        ax.bar(
+            [str(event) for event, _ in frequencies],
+            [count for _, count in frequencies],
+            color="skyblue",
+        )
+        ax.set_xlabel("Event Type")
+        ax.set_ylabel("Frequency")
+        ax.set_title("Event Frequency by Type")
+        plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
+        fig.tight_layout()
+        buffer = BytesIO()
+        fig.savefig(buffer, format="PNG", bbox_inches="tight")  # Ensure nothing is cut
+    finally:
+        plt.close(fig)
+    return buffer.getvalue()
+
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def _render_line_chart(date_frequencies):
+    fig, ax = plt.subplots(figsize=(8, 4))
+    try:
+        ax.plot(
+            [day for day, _ in date_frequencies],
+            [count for _, count in date_frequencies],
+            marker="o",
+            color="orange",
+        )
+        ax.set_xlabel("Date")
+        ax.set_ylabel("Number of Events")
+        ax.set_title("Events Over Time")
+        plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
+        fig.tight_layout()
+        buffer = BytesIO()
+        fig.savefig(buffer, format="PNG", bbox_inches="tight")
+    finally:
+        plt.close(fig)
+    return buffer.getvalue()
+
+
+def create_charts(data):
+    """
+    Render the event-type bar chart and events-over-time line chart as PNG
+    buffers. Images are cached by their aggregated counts, so identical
+    reports reuse them.
+    """
+    return create_charts_from_counts(*aggregate_events(data))
+
+
+def create_charts_from_counts(type_counts, date_counts):
+    """Render both charts from already aggregated Counters."""
+    return (
+        BytesIO(_render_bar_chart(_chart_key(type_counts))),
+        BytesIO(_render_line_chart(_chart_key(date_counts))),
+    )
+
+
+@lru_cache(maxsize=1)
+def _logo():
+    # Decoded once per process and shared by every report
+    return ImageReader(LOGO_PATH)
+
+
+def _event_table(rows, header=False):
+    """Build a Table of event rows with wrapped descriptions, or the header row."""
+    if header:
+        cells = [[Paragraph(title, HEADER_STYLE) for title in TABLE_HEADERS]]
+    else:
+        cells = [
+            [
+                entry["event_date"].strftime("%Y-%m-%d"),
+                entry["start_time"].strftime("%H:%M"),
+                entry["end_time"].strftime("%H:%M"),
+                Paragraph(escape(entry["event_type"] or ""), CELL_STYLE),
+                Paragraph(escape(entry["description"] or ""), CELL_STYLE),
+            ]
+            for entry in rows
+        ]
+    table = Table(cells, colWidths=TABLE_COLUMN_WIDTHS)
+    table.setStyle(HEADER_TABLE_STYLE if header else ROW_TABLE_STYLE)
+    return table
+
+
+def _page_frame(top):
+    """A frame for the event table from `top` down to the bottom margin."""
+    width, _ = A4
+    return Frame(
+        PAGE_MARGIN,
+        PAGE_MARGIN,
+        width - 2 * PAGE_MARGIN,
+        top - PAGE_MARGIN,
+        leftPadding=0,
+        rightPadding=0,
+        topPadding=0,
+        bottomPadding=0,
+    )
+
+
+def _draw_title_block(c, entity_type, entity_name, date_range):
+    """Draw the logo, title and report details; return the y below them."""
+    width, height = A4
+    logo_y_position = height - 150
+    logo_width, logo_height = 100, 100
+
+    border_padding = 10
+    c.setStrokeColorRGB(0, 0, 0)
+    c.setLineWidth(1)
+    c.roundRect(
+        width / 2 - (logo_width / 2) - border_padding,
+        logo_y_position - border_padding,
+        logo_width + (border_padding * 2),
+        logo_height + (border_padding * 2),
+        10,
+    )
+    c.drawImage(
+        _logo(),
+        width / 2 - (logo_width / 2),
+        logo_y_position,
+        width=logo_width,
+        height=logo_height,
+    )
+
+    # Title and meta information
+    c.setFont("Helvetica-Bold", 16)
+    c.drawCentredString(width / 2, logo_y_position - 50, f"{entity_type} Report")
+    c.setFont("Helvetica", 12)
+    c.drawString(50, logo_y_position - 80, f"Name: {entity_name}")
+    c.drawString(
+        50,
+        logo_y_position - 100,
+        f"Date Range: {date_range[0].strftime('%Y-%m-%d')} to {date_range[1].strftime('%Y-%m-%d')}",
+    )
+    c.drawString(
+        50,
+        logo_y_position - 120,
+        # Cached copies are served while the data is unchanged, so this is
+        # when the data was read rather than when the file was downloaded
+        f"Data as of: {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+    )
+    return logo_y_position - 140
+
+
+def _draw_charts(c, type_counts, date_counts):
+    width, height = A4
+    bar_chart, line_chart = create_charts_from_counts(type_counts, date_counts)
+
+    x_margin = 50
+    chart_width = width - 2 * x_margin
+    chart_max_height = 200
+
+    c.setFont("Helvetica", 12)
+    c.drawImage(
+        ImageReader(bar_chart),
+        x_margin,
+        height - 300,
+        width=chart_width,
+        height=chart_max_height,
+        preserveAspectRatio=True,
+        anchor="c",
+    )
+    c.drawString(x_margin, height - 320, "Figure 1: Event Frequency by Type")
+
+    c.drawImage(
+        ImageReader(line_chart),
+        x_margin,
+        height - 550,
+        width=chart_width,
+        height=chart_max_height,
+        preserveAspectRatio=True,
+        anchor="c",
+    )
+    c.drawString(x_margin, height - 570, "Figure 2: Events Over Time")
+
+
+class _PageFlow:
+    """
+    Places flowables in page-sized Frames on a canvas, splitting them and
+    starting a new page whenever the current one is full.
+    """
+
+    def __init__(self, c, top, page_header=None):
+        self.c = c
+        self.page_header = page_header
+        self.frame = _page_frame(top)
+        # Whether the frame is an empty full page (besides the page header)
+        self.fresh_page = False
+        self._add_page_header()
+
+    def _add_page_header(self):
+        if self.page_header:
+            self.frame.add(self.page_header(), self.c)
+
+    def new_page(self):
+        _, height = A4
+        self.c.showPage()
+        self.frame = _page_frame(height - PAGE_MARGIN)
+        self.fresh_page = True
+        self._add_page_header()
+
+    def place(self, flowable):
+        pending = [flowable]
+        while pending:
+            flowable = pending.pop(0)
+            if self.frame.add(flowable, self.c):
+                self.fresh_page = False
+                continue
+            parts = self.frame.split(flowable, self.c)
+            if len(parts) > 1 and self.frame.add(parts[0], self.c):
+                pending[:0] = parts[1:]
+            elif self.fresh_page:
+                raise ValueError("A report row is too tall to fit on a page.")
+            else:
+                pending.insert(0, flowable)
+            self.new_page()
+
+
+def generate_pdf_report(data, entity_type, entity_name, date_range, progress=None):
+    """
+    Render a schedule report as a PDF in a BytesIO buffer.
+
+    `data` may be any iterable of event rows. Rows are laid out in Tables of
+    TABLE_CHUNK_ROWS rows that flow through one page-sized Frame at a time,
+    and chart counts are accumulated on the way. Only one chunk of
+    flowables is held at a time, whatever the number of rows. `progress` is
+    called with the number of rows laid out after each chunk.
+    """
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+
+    flow = _PageFlow(
+        c,
+        _draw_title_block(c, entity_type, entity_name, date_range),
+        page_header=lambda: _event_table(None, header=True),
+    )
+
+    type_counts = Counter()
+    date_counts = Counter()
+    chunk = []
+    rows = 0
+    for entry in data:
+        type_counts[entry["event_type"]] += 1
+        date_counts[entry["event_date"]] += 1
+        chunk.append(entry)
+        if len(chunk) == TABLE_CHUNK_ROWS:
+            flow.place(_event_table(chunk))
+            rows += len(chunk)
+            chunk = []
+            if progress:
+                progress(rows)
+    if chunk:
+        flow.place(_event_table(chunk))
+
+    c.showPage()
+    _draw_charts(c, type_counts, date_counts)
+
+    c.save()
+    buffer.seek(0)
+
+    return buffer
+
+
+def schedule_watermark(entity_type, entity_id, start_date, end_date):
+    """
+    Fingerprint the Schedule rows a report covers. Any insert, update or
+    delete of a matching row changes it (each row's xmin changes on update).
+    """
+    column = ENTITY_COLUMNS[entity_type]
+    with connect() as conn:
+        return conn.execute(
+            text(f"""
+                SELECT md5(COALESCE(
+                    string_agg(schedule_id || ':' || xmin, ',' ORDER BY schedule_id),
+                    ''
+                ))
+                FROM Schedule
+                WHERE {column} = :entity_id
+                    AND event_date BETWEEN :start_date AND :end_date
+            """),
+            {"entity_id": entity_id, "start_date": start_date, "end_date": end_date},
+        ).scalar_one()
+
+
+def build_report(
+    entity_type, entity_id, start_date, end_date, entity_name=None, progress=None
+):
+    """
+    Fetch and render a report, returning (file_name, pdf_bytes).
+    The entity's name is looked up when not given; `progress` is passed on to
+    generate_pdf_report().
+
+    Reports are served from the on-disk report cache while the matching
+    Schedule rows are unchanged.
+    """
+    if entity_name is None:
+        column = ENTITY_COLUMNS[entity_type]
+        with connect() as conn:
+            entity_name = conn.execute(
+                text(
+                    f"SELECT name FROM {ENTITY_TABLES[entity_type]} "
+                    f"WHERE {column} = :entity_id"
+                ),
+                {"entity_id": entity_id},
+            ).scalar_one()
+
+    key = report_cache.cache_key(
+        REPORT_FORMAT_VERSION,
+        entity_type,
+        entity_id,
+        entity_name,
+        start_date,
+        end_date,
+        schedule_watermark(entity_type, entity_id, start_date, end_date),
+    )
+    pdf = report_cache.get(key)
+    if pdf is None:
+        # Closed explicitly so a failed render returns the connection at once
+        with closing(
+            stream_report_data(entity_type, entity_id, start_date, end_date)
+        ) as rows:
+            pdf = generate_pdf_report(
+                rows,
+                entity_type,
+                entity_name,
+                (start_date, end_date),
+                progress=progress,
+            ).getvalue()
+        report_cache.put(key, pdf)
+    return report_file_name(entity_type, entity_name), pdf
+
+
+def fetch_batch_report_data(entity_types, start_date, end_date):
+    """
+    Fetch the schedules of every resident and/or staff member in a date range
+    with one query, and partition them per entity.
+
+    Returns {(entity_type, entity_id): (entity_name, rows)}. Entities without
+    events in the range get an empty list.
+    """
+    selects = []
+    for entity_type in entity_types:
+        column = ENTITY_COLUMNS[entity_type]
+        selects.append(f"""
+            SELECT '{entity_type}' AS entity_type, e.{column} AS entity_id, e.name,
+                s.event_date, s.start_time, s.end_time, s.event_type, s.description
+            FROM {ENTITY_TABLES[entity_type]} e
+            LEFT JOIN Schedule s ON s.{column} = e.{column}
+                AND s.event_date BETWEEN :start_date AND :end_date
+        """)
+    sql = " UNION ALL ".join(selects) + " ORDER BY 1, 2, 4, 5"
+
+    with connect() as conn:
+        results = conn.execute(
+            text(sql), {"start_date": start_date, "end_date": end_date}
+        ).fetchall()
+
+    partitions = {}
+    for (entity_type, entity_id, name), rows in groupby(
+        results, key=lambda row: (row[0], row[1], row[2])
+    ):
+        partitions[(entity_type, entity_id)] = (
+            name,
+            [dict(zip(REPORT_COLUMNS, row[3:])) for row in rows if row[3] is not None],
+        )
+    return partitions
+
+
+def _render_batch_report(entity_type, entity_id, entity_name, data, date_range):
+    # Module-level so the process pool can pickle it
+    pdf_buffer = generate_pdf_report(data, entity_type, entity_name, date_range)
+    file_name = f"{entity_type}/{entity_id}_{entity_name}.pdf".replace(" ", "_")
+    return file_name, pdf_buffer.getvalue()
+
+
+def build_batch_report(
+    entity_types, start_date, end_date, max_workers=None, progress=None
+):
+    """
+    Render a report for every resident and/or staff member in parallel and
+    return them as ZIP bytes. `progress` is called with (done, total).
+
+    PDFs are rendered in a process pool because matplotlib and reportlab are
+    CPU-bound and not thread-safe.
+    """
+    partitions = fetch_batch_report_data(entity_types, start_date, end_date)
+    total = len(partitions)
+    date_range = (start_date, end_date)
+
+    archive = BytesIO()
+    # Spawned, so children never inherit the parent's threads or connections
+    context = multiprocessing.get_context("spawn")
+    with (
+        zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zip_file,
+        ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool,
+    ):
+        futures = [
+            pool.submit(
+                _render_batch_report, entity_type, entity_id, name, data, date_range
+            )
+            for (entity_type, entity_id), (name, data) in partitions.items()
+        ]
+        for done, future in enumerate(as_completed(futures), start=1):
+            file_name, pdf = future.result()
+            zip_file.writestr(file_name, pdf)
+            if progress:
+                progress(done, total)
+
+    return archive.getvalue()
+
+
+def batch_report_file_name(entity_types, start_date, end_date):
+    return (
+        f"{'_'.join(entity_types)}_Reports_"
+        f"{start_date.strftime('%Y%m%d')}-{end_date.strftime('%Y%m%d')}.zip"
+    )
+
+
+FACILITY_SCHEDULE_QUERY = """
+    WITH events AS (
+        SELECT s.event_type, s.event_date, s.staff_id, st.name AS staff_name,
+            EXTRACT(EPOCH FROM CASE
+                WHEN s.end_time >= s.start_time THEN s.end_time - s.start_time
+                ELSE s.end_time - s.start_time + INTERVAL '24 hours'
+            END) / 3600 AS hours
+        FROM Schedule s
+        LEFT JOIN Staff st ON st.staff_id = s.staff_id
+        WHERE s.event_date BETWEEN :start_date AND :end_date
+    )
+    SELECT
+        CASE
+            WHEN GROUPING(event_type, event_date) = 0 THEN 'type_day'
+            WHEN GROUPING(event_type) = 0 THEN 'type'
+            WHEN GROUPING(staff_id) = 0 THEN 'staff'
+            ELSE 'total'
+        END AS grouping_set,
+        event_type, event_date, staff_id, staff_name,
+        COUNT(*) AS events,
+        ROUND(COALESCE(SUM(hours), 0)::numeric, 2) AS hours,
+        ROUND(
+            (100 * SUM(hours) / NULLIF(SUM(SUM(hours)) OVER (
+                PARTITION BY GROUPING(event_type, event_date, staff_id, staff_name)
+            ), 0))::numeric,
+            1
+        ) AS hours_share,
+        RANK() OVER (
+            PARTITION BY GROUPING(event_type, event_date, staff_id, staff_name)
+            ORDER BY SUM(hours) DESC NULLS LAST
+        ) AS workload_rank
+    FROM events
+    GROUP BY GROUPING SETS (
+        (event_type, event_date), (event_type), (staff_id, staff_name), ()
+    )
+    ORDER BY grouping_set, event_date, event_type, workload_rank
+"""
+
+FACILITY_RESIDENT_QUERY = """
+    SELECT 'idle_resident' AS section, r.name AS label, NULL::bigint AS records,
+        NULL::bigint AS residents, last_event.event_date AS last_event_date
+    FROM Resident r
+    LEFT JOIN LATERAL (
+        SELECT MAX(event_date) AS event_date
+        FROM Schedule
+        WHERE resident_id = r.resident_id AND event_date < :start_date
+    ) last_event ON true
+    WHERE NOT EXISTS (
+        SELECT 1
+        FROM Schedule s
+        WHERE s.resident_id = r.resident_id
+            AND s.event_date BETWEEN :start_date AND :end_date
+    )
+    UNION ALL
+    SELECT 'diagnosis', COALESCE(diagnosis, 'Unspecified'), COUNT(*),
+        COUNT(DISTINCT resident_id), NULL
+    FROM Medical_Record
+    WHERE record_date BETWEEN :start_date AND :end_date
+    GROUP BY COALESCE(diagnosis, 'Unspecified')
+    ORDER BY section, records DESC NULLS LAST, label
+"""
+
+
+def fetch_facility_summary(start_date, end_date):
+    """
+    Summarise the whole facility over a date range with two aggregate queries:
+    events per type per day and per type, staff workload hours (with each
+    member's share and rank), residents without any events, and medical
+    record counts per diagnosis. Only summary rows reach Python.
+    """
+    params = {"start_date": start_date, "end_date": end_date}
+    schedule = query(FACILITY_SCHEDULE_QUERY, params)
+    residents = query(FACILITY_RESIDENT_QUERY, params)
+
+    def grouping_set(name, columns):
+        rows = schedule[schedule["grouping_set"] == name]
+        return rows[columns].reset_index(drop=True)
+
+    staff = grouping_set(
+        "staff", ["staff_name", "events", "hours", "hours_share", "workload_rank"]
+    )
+    staff["staff_name"] = staff["staff_name"].fillna("Unassigned")
+    totals = grouping_set("total", ["events", "hours"])
+    idle = residents[residents["section"] == "idle_resident"]
+    diagnoses = residents[residents["section"] == "diagnosis"]
+    return {
+        "events": int(totals["events"].iloc[0]) if not totals.empty else 0,
+        "hours": float(totals["hours"].iloc[0]) if not totals.empty else 0.0,
+        "type_day": grouping_set("type_day", ["event_date", "event_type", "events"]),
+        "types": grouping_set("type", ["event_type", "events", "hours"]),
+        "staff": staff,
+        "idle_residents": idle[["label", "last_event_date"]].reset_index(drop=True),
+        "diagnoses": diagnoses[["label", "records", "residents"]].reset_index(
+            drop=True
+        ),
+    }
+
+
+def _summary_tables(headers, rows, column_widths):
+    """Yield Tables of at most TABLE_CHUNK_ROWS rows, the first with a header."""
+    header = [Paragraph(title, HEADER_STYLE) for title in headers]
+    cells = [["-" if value is None else str(value) for value in row] for row in rows]
+    if not cells:
+        cells = [["No data."] + [""] * (len(headers) - 1)]
+    for start in range(0, len(cells), TABLE_CHUNK_ROWS):
+        chunk = cells[start : start + TABLE_CHUNK_ROWS]
+        table = Table(
+            [header, *chunk] if start == 0 else chunk,
+            colWidths=column_widths,
+            repeatRows=1 if start == 0 else 0,
+        )
+        table.setStyle(ROW_TABLE_STYLE)
+        yield table
+
+
+def generate_facility_pdf(summary, date_range):
+    """Render a fetch_facility_summary() result as a PDF in a BytesIO buffer."""
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    flow = _PageFlow(
+        c, _draw_title_block(c, "Facility", "All residents and staff", date_range)
+    )
+
+    def section(title, headers, frame, column_widths):
+        flow.place(Paragraph(title, SECTION_STYLE))
+        rows = frame.astype(object).where(frame.notna(), None).itertuples(index=False)
+        for table in _summary_tables(headers, rows, column_widths):
+            flow.place(table)
+
+    flow.place(
+        Paragraph(
+            f"{summary['events']} events, {summary['hours']:.1f} scheduled hours, "
+            f"{len(summary['idle_residents'])} residents without activities.",
+            CELL_STYLE,
+        )
+    )
+    section(
+        "Events per Type",
+        ["Event Type", "Events", "Hours"],
+        summary["types"],
+        [245, 125, 125],
+    )
+    section(
+        "Staff Workload",
+        ["Staff", "Events", "Hours", "Share (%)", "Rank"],
+        summary["staff"],
+        [175, 80, 80, 80, 80],
+    )
+    section(
+        "Residents Without Activities",
+        ["Resident", "Last Event Before Range"],
+        summary["idle_residents"],
+        [245, 250],
+    )
+    section(
+        "Medical Records per Diagnosis",
+        ["Diagnosis", "Records", "Residents"],
+        summary["diagnoses"],
+        [245, 125, 125],
+    )
+    section(
+        "Events per Type per Day",
+        ["Date", "Event Type", "Events"],
+        summary["type_day"],
+        [125, 245, 125],
+    )
+
+    c.showPage()
+    c.save()
+    buffer.seek(0)
+    return buffer
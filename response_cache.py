@@ -0,0 +1,73 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+
+MAX_ENTRIES = 1000
+RESPONSE_TTL = 3600  # seconds
+
+_entries = OrderedDict()
+_stats = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0}
+_lock = threading.Lock()
+
+
+def normalize_prompt(prompt):
+    """Lower-case, collapse whitespace and drop surrounding punctuation."""
+    return re.sub(r"\s+", " ", prompt.lower()).strip(" .,!?;:")
+
+
+def cache_key(prompt, context_block, model, history=()):
+    """
+    Key a response by the normalized prompt, the model and hashes of the
+    context block and conversation history, so any change in the context
+    yields a different key and follow-ups are only shared by identical chats.
+    """
+    context_hash = hashlib.sha256(context_block.encode()).hexdigest()
+    history_hash = hashlib.sha256(json.dumps(list(history)).encode()).hexdigest()
+    return hashlib.sha256(
+        "\x1f".join(
+            [model, context_hash, history_hash, normalize_prompt(prompt)]
+        ).encode()
+    ).hexdigest()
+
+
+def get(key):
+    """Return the cached response for `key`, or None, counting hits and misses."""
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry[0] < time.monotonic():
+            del _entries[key]
+            _stats["expired"] += 1
+            entry = None
+        if entry is None:
+            _stats["misses"] += 1
+            return None
+        _entries.move_to_end(key)
+        _stats["hits"] += 1
+        return entry[1]
+
+
+def put(key, response, ttl=RESPONSE_TTL):
+    """Cache a response, evicting the least recently used beyond MAX_ENTRIES."""
+    with _lock:
+        _entries[key] = (time.monotonic() + ttl, response)
+        _entries.move_to_end(key)
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+            _stats["evicted"] += 1
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+
+
+def stats():
+    """Return hit/miss counters, the hit rate and the number of cached responses."""
+    with _lock:
+        result = dict(_stats, entries=len(_entries))
+    lookups = result["hits"] + result["misses"]
+    result["hit_rate"] = result["hits"] / lookups if lookups else 0.0
+    return result
@@ -0,0 +1,74 @@
+import pytest
+
+from intent_router import answer_intent, classify_intent
+
+CONTEXT = {
+    "resident": {"name": "Ann"},
+    "admin": {"name": "Office", "contact_number": "0123456789"},
+    "emergency_contacts": [
+        {"contact_name": "Ben", "relationship": "Son", "contact_number": "0198765432"}
+    ],
+    "schedule": [],
+    "medications": [],
+}
+
+
+@pytest.mark.parametrize(
+    "prompt, intent",
+    [
+        ("What is my schedule today?", "schedule"),
+        ("what's on my schedule", "schedule"),
+        ("Show my activities for today", "schedule"),
+        ("What are my medications?", "medication"),
+        ("list my pills", "medication"),
+        ("Who is my next of kin?", "emergency_contact"),
+        ("Who is my emergency contact", "emergency_contact"),
+        ("What is the admin's number?", "admin_contact"),
+    ],
+)
+def test_lookups_are_answered_locally(prompt, intent):
+    assert classify_intent(prompt) == intent
+
+
+@pytest.mark.parametrize(
+    "prompt",
+    [
+        # Other days than today
+        "Do I have any appointments this weekend",
+        "what activities are planned in December",
+        "what is my schedule on the 5th",
+        "What is my schedule tomorrow?",
+        "show my schedule for next week",
+        "What events do I have on Friday",
+        # Questions a bare schedule list does not answer
+        "Do I have an appointment with the doctor",
+        "When is my next appointment?",
+        "How do I reach the admin office",
+        # Medication advice and yes/no questions
+        "can I stop taking my pills",
+        "am I allergic to any of my medicine",
+        "is my medication covered by insurance",
+        "What are the side effects of my medication?",
+        "should I take my medicine before food",
+        "What dose of my pills do I take",
+        # Open-ended or ambiguous
+        "Tell me about gardens",
+        "What is my schedule and my medication",
+        "",
+    ],
+)
+def test_other_prompts_go_to_the_model(prompt):
+    assert classify_intent(prompt) is None
+
+
+@pytest.mark.parametrize(
+    "intent, expected",
+    [
+        ("schedule", "You have no events scheduled for today."),
+        ("medication", "No medications are recorded for you."),
+        ("emergency_contact", "Ben (Son): 0198765432"),
+        ("admin_contact", "You can reach Office at 0123456789."),
+    ],
+)
+def test_answers_use_the_context(intent, expected):
+    assert expected in answer_intent(intent, CONTEXT)
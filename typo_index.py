@@ -0,0 +1,153 @@
+import re
+from collections import defaultdict
+from itertools import combinations
+
+WORD_PATTERN = re.compile(r"[A-Za-z][A-Za-z0-9'-]*")
+
+# Everyday words that are never "corrected" into a similar vocabulary term
+COMMON_WORDS = frozenset(
+    """
+    a about after again all am an and any are as at be been before but by can
+    could day did do does doing done for from get give go going had has have
+    he her here him his how i if in is it its just know last like made make
+    many me more morning most my need new next night no not now of on one or
+    other our out over part please right see she should so some take taken
+    tell than thank thanks that the their them then there these they this
+    those time to today tomorrow too two up us use want was we week well were
+    what when where which who whom why will with would yes yesterday you your
+    """.split()
+)
+
+
+def _deletes(word, max_distance):
+    """Every string obtained by deleting up to `max_distance` characters."""
+    variants = {word}
+    for count in range(1, min(max_distance, len(word)) + 1):
+        for positions in combinations(range(len(word)), count):
+            variants.add(
+                "".join(char for i, char in enumerate(word) if i not in positions)
+            )
+    return variants
+
+
+def edit_distance(a, b):
+    """Optimal string alignment distance (Levenshtein plus transpositions)."""
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(
+                previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost
+            )
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def allowed_distance(word):
+    """How many edits a word of this length may be corrected by."""
+    if len(word) < 4:
+        return 0
+    if len(word) < 8:
+        return 1
+    return 2
+
+
+class TypoIndex:
+    """
+    Symmetric-delete spelling index. Every vocabulary word is stored under all
+    of its deletion variants, so a lookup only generates the deletions of the
+    misspelt word and checks the few candidates that share one.
+
+    Words that are only part of a name are correction targets for capitalised
+    words alone, so "hope" stays as typed while "Hpoe" becomes "Hope".
+    """
+
+    def __init__(self, words=(), names=(), max_distance=2):
+        self.max_distance = max_distance
+        self.vocabulary = set()
+        self.name_words = set()
+        self.known_words = set(COMMON_WORDS)
+        self._deletes = defaultdict(set)
+        self.add(words)
+        self.add(names, names=True)
+
+    def add(self, words, names=False):
+        """
+        Add words (or multi-word names, indexed per word) to the vocabulary.
+        With `names`, words not already in it are only matched when capitalised.
+        """
+        for phrase in words:
+            for word in WORD_PATTERN.findall(str(phrase).lower()):
+                if allowed_distance(word) == 0:
+                    continue
+                if word in self.vocabulary:
+                    if not names:
+                        self.name_words.discard(word)
+                    continue
+                self.vocabulary.add(word)
+                if names:
+                    self.name_words.add(word)
+                for variant in _deletes(word, self.max_distance):
+                    self._deletes[variant].add(word)
+
+    def add_known(self, words):
+        """Mark words as correct as typed, without making them correction targets."""
+        self.known_words.update(word.lower() for word in words)
+
+    def lookup(self, word, names=True):
+        """
+        Return the vocabulary words closest to `word`, within its allowed
+        distance. Name-only words are left out unless `names`.
+        """
+        word = word.lower()
+        if word in self.vocabulary:
+            return [word]
+        max_distance = min(allowed_distance(word), self.max_distance)
+        if max_distance == 0:
+            return []
+
+        candidates = set()
+        for variant in _deletes(word, max_distance):
+            candidates.update(self._deletes.get(variant, ()))
+        if not names:
+            candidates -= self.name_words
+
+        best = []
+        best_distance = max_distance + 1
+        for candidate in candidates:
+            distance = edit_distance(word, candidate)
+            if distance < best_distance:
+                best, best_distance = [candidate], distance
+            elif distance == best_distance:
+                best.append(candidate)
+        return sorted(best)
+
+    def correct(self, text):
+        """
+        Correct vocabulary typos in `text` in place. Known words are never
+        changed, and only capitalised words are corrected into names.
+        Returns (corrected_text, {word: candidates}) for words with several
+        equally close candidates, which are left as typed.
+        """
+        ambiguous = {}
+
+        def replace(match):
+            word = match.group(0)
+            lowered = word.lower()
+            if lowered in self.known_words or lowered in self.vocabulary:
+                return word
+            candidates = self.lookup(lowered, names=word[0].isupper())
+            if len(candidates) == 1:
+                # Keep the typed capitalisation, e.g. for names
+                return (
+                    candidates[0].capitalize() if word[0].isupper() else candidates[0]
+                )
+            if candidates:
+                ambiguous[word] = candidates
+            return word
+
+        return WORD_PATTERN.sub(replace, text), ambiguous